@@ -1,43 +1,81 @@
 import csv
+from typing import Iterable
+
+from movie import predicates, timeseries
+from movie.cache import ReportCache, cached_report
+from movie.catalog import MovieCatalog, KEEP_FIRST
 from movie.movie import create_movie, Movie, ActionAdventure, Comedy, Drama, Horror, Romance, ScienceFictionFantasy, Western
-from person.person import Person
+from person.person import Person, DEFAULT_THRESHOLD
 from movie.rating import MovieRating
 
 
 # =====================
 # Function to load CSV
 # =====================
-def load_movies(filename: str) -> list[Movie]:
+def load_movies(filename: str, on_duplicate: str = KEEP_FIRST,
+                director_threshold: float = DEFAULT_THRESHOLD) -> MovieCatalog:
 
     """
-        Load all movies from a CSV file into a list of Movie objects.
+        Load all movies from a CSV file into a MovieCatalog.
+
+        Rows are deduplicated on rotten_tomatoes_link while streaming through the
+        file, using the primary-key index of the catalog.
 
         :param filename: Path to the CSV file containing movie data.
-        :return: List of Movie objects. Movies that could not be created are skipped.
+        :param on_duplicate: Conflict policy for a link that was already loaded:
+                             "first" (keep the first row), "last" (keep the last row)
+                             or "error" (raise a ValueError).
+        :param director_threshold: Minimum similarity to match a director name with an
+                                   existing person ('Chris Columbus' and 'Christopher Columbus'),
+                                   or None to only merge names that are equal after normalization.
+        :return: MovieCatalog of Movie objects. Movies that could not be created are skipped.
         """
-    movies = []
+    movies = MovieCatalog(on_duplicate=on_duplicate)
     skipped = 0
 
     with open(filename, newline="", encoding="latin1") as csvfile:
         reader = csv.DictReader(csvfile)
         for row in reader:
             try:
-                movie = create_movie(row)
-                movies.append(movie)
+                movie = create_movie(row, director_threshold)
             except Exception:
                 skipped += 1
+                continue
+            movies.add(movie)
 
     if skipped > 0:
         print(f"{skipped} movies were skipped due to missing or invalid data.")
+    if movies.duplicates > 0:
+        print(f"{movies.duplicates} movies had a duplicate rt_link (policy: {on_duplicate}).")
 
     return movies
 
 
+def select_movies(movies: Iterable[Movie], links: Iterable[str] = None) -> list[Movie]:
+    """
+        Restrict a collection of movies to a set of rt_links.
+
+        :param movies: MovieCatalog or list of Movie objects
+        :param links: rt_links to keep, or None to keep all movies
+        :return: List of the selected Movie objects, in the order of movies
+        """
+    if links is None:
+        return list(movies)
+    if isinstance(movies, MovieCatalog):
+        return movies.select(links)
+    wanted = set(links)
+    return [m for m in movies if m.rt_link in wanted]
+
+
+
+# Results of the reports, reused while the catalog does not change
+REPORT_CACHE = ReportCache(maxsize=64, max_chars=10_000_000)
 
 
 # =====================
 # Menu Option 1
 # =====================
+@cached_report(REPORT_CACHE)
 def print_number_of_films(movies: list[Movie]) -> None:
     """
         Print the total number of movies in the list.
@@ -52,6 +90,7 @@ def print_number_of_films(movies: list[Movie]) -> None:
 # =====================
 # Menu Option 2
 # =====================
+@cached_report(REPORT_CACHE)
 def print_films_per_genre(movies: list[Movie]) -> None:
     """
         Count and print the number of movies in each genre.
@@ -116,6 +155,7 @@ def print_number_of_persons() -> None:
 # =====================
 # Menu Option 4
 # =====================
+@cached_report(REPORT_CACHE)
 def print_highest_score(movies: list[Movie]) -> None:
     """
         Print the movie(s) with the highest relevant score from a list of movies.
@@ -139,6 +179,7 @@ def print_highest_score(movies: list[Movie]) -> None:
 # =====================
 # Menu Option 5
 # =====================
+@cached_report(REPORT_CACHE)
 def print_most_active_director(movies: list[Movie]) -> None:
     """
         Print the director(s) who have directed the most movies in the given list.
@@ -185,6 +226,7 @@ def print_most_active_director(movies: list[Movie]) -> None:
 # =====================
 # Menu Option 6
 # =====================
+@cached_report(REPORT_CACHE)
 def print_shortest_and_longest(movies: list[Movie]) -> None:
     """
         Print the shortest and longest movies from the given list.
@@ -211,6 +253,7 @@ def print_shortest_and_longest(movies: list[Movie]) -> None:
 # =====================
 # Menu Option 7
 # =====================
+@cached_report(REPORT_CACHE)
 def print_scary_horror(movies: list[Movie]) -> None:
     """
         Print all horror movies from the list that are considered scary.
@@ -218,18 +261,31 @@ def print_scary_horror(movies: list[Movie]) -> None:
         :param movies: List of Movie objects to evaluate
         :return: None
         """
-    scary_movies = [m for m in movies if type(m).__name__ == "Horror" and m.is_scary()]
-    if not scary_movies:
-        print("No scary horror movies found.")
+    print_titles(predicates.select(movies, "scary"), "Scary horror movies:",
+                 "No scary horror movies found.")
+
+
+def print_titles(movies: list[Movie], header: str, empty_message: str) -> None:
+    """
+        Print a header followed by the titles of the given movies.
+
+        :param movies: List of Movie objects to print
+        :param header: Line printed before the titles
+        :param empty_message: Line printed instead when there are no movies
+        :return: None
+        """
+    if not movies:
+        print(empty_message)
         return
-    print("Scary horror movies:")
-    for m in scary_movies:
+    print(header)
+    for m in movies:
         print(f"- {m.title}")
 
 
 # =====================
 # Menu Option 8
 # =====================
+@cached_report(REPORT_CACHE)
 def print_score_list(movies: list[Movie]) -> None:
     """
         Print the number of movies for each score from 0 to 100.
@@ -252,47 +308,61 @@ def print_score_list(movies: list[Movie]) -> None:
         count = score_count.get(score, 0)
         print(f"{score}%: {count}")
 
-        # =====================
-# Menu Option 9
+
+
 # =====================
-def print_uneven_month_releases(movies):
+# Menu Option 10
+# =====================
+@cached_report(REPORT_CACHE)
+def print_uneven_month_releases(movies: list[Movie]) -> None:
     """
         Print the titles of movies that were released in an uneven-numbered month.
 
         :param movies: List of Movie objects to evaluate
         :return: None
         """
-    months = [1, 3, 5, 7, 9, 11]  # even months
+    months = [1, 3, 5, 7, 9, 11]  # uneven months
 
     uneven_movies = [
         m for m in movies
         if m.release_date is not None and m.release_date.month in months
     ]
 
-    if not uneven_movies:
-        print("No movies released in an even month.")
-        return
-
-    print("Movies released in an even month:")
-    for m in uneven_movies:
-        print(f"- {m.title}")
+    print_titles(uneven_movies, "Movies released in an uneven month:",
+                 "No movies released in an uneven month.")
 
 
 
 # =====================
-# Menu Option 10
+# Menu Option 9
 # =====================
-def export_no_relevant_score(movies: list[Movie]) -> None:
+def export_no_relevant_score(movies: list[Movie], links: Iterable[str] = None,
+                             filename: str = "no_relevant_score.csv") -> None:
     """
             Export all movies without a relevant score to a CSV file.
 
             :param movies: List of Movie objects to filter and export.
+            :param links: Optional rt_links; only these movies are exported.
+            :param filename: Path of the CSV file to write.
+            :return: None
+            """
+    filtered = [m for m in select_movies(movies, links) if not m.relevant_score()]
+    export_movies(filtered, filename)
+
+
+def export_movies(movies: list[Movie], filename: str, links: Iterable[str] = None) -> None:
+    """
+            Export movies to a CSV file, sorted by title.
+
+            :param movies: List of Movie objects to export.
+            :param filename: Path of the CSV file to write.
+            :param links: Optional rt_links; only these movies are exported.
             :return: None
             """
-    filtered = [m for m in movies if not m.relevant_score()]
+    filtered = select_movies(movies, links)
 
     filtered.sort(key=lambda m: m.title)
-    with open("no_relevant_score.csv", "w", newline="", encoding="utf-8") as f:
+    with open(filename, "w", newline="", encoding="utf-8") as f:
         writer = csv.writer(f)
         #  header
         writer.writerow(["rt_link", "title", "rating", "genre", "directors", "release_date",
@@ -303,7 +373,167 @@ def export_no_relevant_score(movies: list[Movie]) -> None:
             writer.writerow([m.rt_link, m.title, m.rating.code, type(m).__name__,
                              directors_str, m.release_date, m.streaming_date, m.length,
                              m.company, m.score, m.count])
-    print("Export completed: no_relevant_score.csv")
+    print(f"Export completed: {filename}")
+
+
+# =====================
+# Menu Option 11
+# =====================
+@cached_report(REPORT_CACHE)
+def print_classics(movies: list[Movie]) -> None:
+    """
+        Print all classic movies: at least 20 years old with a relevant score above 80.
+
+        :param movies: List of Movie objects to evaluate
+        :return: None
+        """
+    print_titles(predicates.select(movies, "classic"), "Classic movies:",
+                 "No classic movies found.")
+
+
+# =====================
+# Menu Option 12
+# =====================
+@cached_report(REPORT_CACHE)
+def print_cosy_romances(movies: list[Movie]) -> None:
+    """
+        Print all romance movies with a cosy length (70 to 100 minutes).
+
+        :param movies: List of Movie objects to evaluate
+        :return: None
+        """
+    print_titles(predicates.select(movies, "cosy"), "Cosy romance movies:",
+                 "No cosy romance movies found.")
+
+
+# =====================
+# Menu Option 13
+# =====================
+@cached_report(REPORT_CACHE)
+def print_slapstick_comedies(movies: list[Movie]) -> None:
+    """
+        Print all comedies with a relevant score below 40.
+
+        :param movies: List of Movie objects to evaluate
+        :return: None
+        """
+    print_titles(predicates.select(movies, "slapstick"), "Slapstick comedies:",
+                 "No slapstick comedies found.")
+
+
+# =====================
+# Menu Option 14
+# =====================
+@cached_report(REPORT_CACHE)
+def print_search_results(movies: MovieCatalog, query: str) -> None:
+    """
+        Print the movies that best match a search text (title, director or company).
+
+        :param movies: MovieCatalog to search
+        :param query: Search text
+        :return: None
+        """
+    print_titles(movies.search(query), f"Films matching '{query}':",
+                 f"No films found for '{query}'.")
+
+
+# =====================
+# Menu Option 15
+# =====================
+@cached_report(REPORT_CACHE)
+def print_releases_per_period(movies: list[Movie], period: str = "year",
+                              field: str = "release_date") -> None:
+    """
+        Print per year, quarter or month the number of movies, the mean score and
+        the total audience count.
+
+        :param movies: MovieCatalog or list of Movie objects to evaluate
+        :param period: "year", "quarter" or "month"
+        :param field: "release_date" or "streaming_date"
+        :return: None
+        """
+    if isinstance(movies, MovieCatalog):
+        index = movies.date_index(field)
+    else:
+        index = timeseries.DateIndex(movies, field)
+
+    buckets = index.buckets(period)
+    if not buckets:
+        print(f"No movies with a {field.replace('_', ' ')}.")
+        return
+
+    print(f"{'Period':<10}{'Films':>8}{'Mean score':>12}{'Audience':>14}")
+    for key, bucket in buckets.items():
+        mean_score = "-" if bucket["mean_score"] is None else f"{bucket['mean_score']:.1f}"
+        print(f"{key:<10}{bucket['count']:>8}{mean_score:>12}{bucket['audience_count']:>14}")
+
+
+# =====================
+# Menu Option 16
+# =====================
+@cached_report(REPORT_CACHE)
+def print_streaming_lag(movies: list[Movie]) -> None:
+    """
+        Print the distribution of the number of days between release and streaming release.
+
+        :param movies: List of Movie objects to evaluate
+        :return: None
+        """
+    distribution = timeseries.lag_distribution(timeseries.streaming_lags(movies))
+    if distribution["count"] == 0:
+        print("No movies with both a release and a streaming date.")
+        return
+
+    print(f"Release to streaming lag of {distribution['count']} films (days):")
+    for name in ("min", "p25", "median", "p75", "p90", "max", "mean"):
+        print(f"{name:>6}: {distribution[name]:.0f}")
+
+
+# =====================
+# Menu Option 17
+# =====================
+def print_cache_stats() -> None:
+    """
+        Print the hit and miss counters of the report cache.
+
+        :return: None
+        """
+    stats = REPORT_CACHE.stats()
+    print(f"Report cache: {stats['hits']} hits, {stats['misses']} misses, "
+          f"{stats['size']}/{stats['maxsize']} results, {stats['evictions']} evictions")
+
+
+# =====================
+# Menu Option 18
+# =====================
+def export_columnar(movies: list[Movie], filename: str, links: Iterable[str] = None,
+                    encode_strings: bool = False) -> None:
+    """
+        Export movies to a columnar file for pandas and other tools. The format
+        follows the extension: .npz (NumPy), .parquet or .arrow (both need pyarrow).
+
+        :param movies: MovieCatalog or list of Movie objects to export.
+        :param filename: Path of the file to write.
+        :param links: Optional rt_links; only these movies are exported.
+        :param encode_strings: Store rating, genre and company as codes with a table
+                               of the distinct strings (smaller .npz and .arrow files).
+        :return: None
+        """
+    from movie import export  # NumPy/pyarrow export is only loaded when it is used
+
+    if links is not None:
+        movies = select_movies(movies, links)
+
+    if filename.endswith(".npz"):
+        export.export_npz(movies, filename, encode_strings=encode_strings)
+    elif filename.endswith(".parquet"):
+        export.export_parquet(movies, filename, encode_strings=encode_strings)
+    elif filename.endswith(".arrow"):
+        export.export_arrow(movies, filename, encode_strings=encode_strings)
+    else:
+        print("Unknown file type; use .npz, .parquet or .arrow.")
+        return
+    print(f"Export completed: {filename}")
 
 
 # =====================
@@ -321,8 +551,16 @@ def show_menu(movies: list[Movie]) -> None:
         print("7: Print all scary horror films.")
         print("8: Print the score list from 0 to 100.")
         print("9: Export films without a relevant score to CSV.")
-        print("10: Print films released in an even month.")
-        print("11: Stop the program")
+        print("10: Print films released in an uneven month.")
+        print("11: Print all classic films.")
+        print("12: Print all cosy romance films.")
+        print("13: Print all slapstick comedies.")
+        print("14: Search films by title, director or company.")
+        print("15: Print release or streaming statistics per year, quarter or month.")
+        print("16: Print the release to streaming lag.")
+        print("17: Print the report cache statistics.")
+        print("18: Export films to .npz, .parquet or .arrow.")
+        print("19: Stop the program")
 
         choice = input("Enter your choice: ")
 
@@ -346,9 +584,44 @@ def show_menu(movies: list[Movie]) -> None:
             export_no_relevant_score(movies)
 
         elif choice == "10":
-            print_even_month_releases(movies)
+            print_uneven_month_releases(movies)
 
         elif choice == "11":
+            print_classics(movies)
+        elif choice == "12":
+            print_cosy_romances(movies)
+        elif choice == "13":
+            print_slapstick_comedies(movies)
+
+        elif choice == "14":
+            print_search_results(movies, input("Search for: "))
+
+        elif choice == "15":
+            period = input("Period (year, quarter, month): ").strip() or "year"
+            date = input("Date (release, streaming): ").strip() or "release"
+            field = f"{date}_date"
+            if period not in timeseries.PERIODS:
+                print("Invalid period.")
+            elif field not in timeseries.DATE_FIELDS:
+                print("Invalid date.")
+            else:
+                print_releases_per_period(movies, period, field)
+
+        elif choice == "16":
+            print_streaming_lag(movies)
+
+        elif choice == "17":
+            print_cache_stats()
+
+        elif choice == "18":
+            try:
+                filename = input("File name: ").strip()
+                encode = input("Encode rating, genre and company (y/n): ").strip().lower() == "y"
+                export_columnar(movies, filename, encode_strings=encode)
+            except ImportError as error:
+                print(error)
+
+        elif choice == "19":
             print("Program stopped.")
             break
         else:
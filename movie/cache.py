@@ -0,0 +1,139 @@
+import functools
+import io
+from collections import OrderedDict
+from contextlib import redirect_stdout
+from typing import Callable
+
+_MISSING = object()
+
+
+class ReportCache:
+    """
+        Least-recently-used cache for report results.
+
+        The cache is meant for the single-threaded menu and is not thread-safe;
+        neither is cached_report, which captures output by redirecting sys.stdout.
+
+        :maxsize: Maximum number of results in the cache.
+        :max_chars: Maximum total length of the cached results (None for no limit).
+        :hits: Number of lookups that found a result.
+        :misses: Number of lookups that did not find a result.
+        :evictions: Number of results removed to stay within the limits.
+        :_entries: OrderedDict of key -> result, least recently used first.
+        """
+
+    def __init__(self, maxsize: int = 128, max_chars: int = None) -> None:
+        """
+                :param maxsize: Maximum number of results in the cache
+                :param max_chars: Maximum total length of the cached results
+                :raises ValueError: If maxsize is smaller than 1
+                """
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1.")
+
+        self.maxsize = maxsize
+        self.max_chars = max_chars
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._chars = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key, default=None):
+        """
+                Look up a result and mark it as recently used.
+
+                :param key: Key of the result
+                :param default: Value returned when the key is not in the cache
+                :return: The cached result or default
+                """
+        value = self._entries.get(key, _MISSING)
+        if value is _MISSING:
+            self.misses += 1
+            return default
+        self.hits += 1
+        self._entries.move_to_end(key)
+        return value
+
+    def put(self, key, value: str) -> None:
+        """
+                Store a result, removing the least recently used results when the cache is full.
+                A result longer than max_chars is not stored.
+
+                :param key: Key of the result
+                :param value: The result
+                """
+        if self.max_chars is not None and len(value) > self.max_chars:
+            return
+        if key in self._entries:
+            self._chars -= len(self._entries.pop(key))
+
+        self._entries[key] = value
+        self._chars += len(value)
+        while len(self._entries) > self.maxsize or (
+                self.max_chars is not None and self._chars > self.max_chars):
+            _, old = self._entries.popitem(last=False)
+            self._chars -= len(old)
+            self.evictions += 1
+
+    def clear(self) -> None:
+        """
+                Remove all results. The counters are kept.
+                """
+        self._entries.clear()
+        self._chars = 0
+
+    def stats(self) -> dict:
+        """
+                :return: Dictionary with "hits", "misses", "evictions", "size", "maxsize" and "chars".
+                """
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "chars": self._chars,
+        }
+
+
+def cached_report(cache: ReportCache) -> Callable:
+    """
+        Decorator for a report that prints its result. The printed text is cached per
+        report name, parameters and catalog version, and printed again from the
+        cache when the same report is asked for an unchanged catalog.
+
+        Only collections with a version (MovieCatalog) are cached; for a plain
+        list the report always runs, because changes to a list cannot be detected.
+        A movie changed in place is only seen after MovieCatalog.touch().
+
+        :param cache: The cache to store the results in
+        :return: Decorator for report functions with the movies as first parameter
+        """
+    def decorator(report: Callable) -> Callable:
+        @functools.wraps(report)
+        def wrapper(movies, *args, **kwargs):
+            version = getattr(movies, "version", None)
+            key = (report.__qualname__, version, args, tuple(sorted(kwargs.items())))
+            try:
+                hash(key)
+            except TypeError:
+                version = None  # parameters that cannot be part of a key
+            if version is None:
+                return report(movies, *args, **kwargs)
+
+            output = cache.get(key)
+            if output is None:
+                buffer = io.StringIO()
+                with redirect_stdout(buffer):
+                    report(movies, *args, **kwargs)
+                output = buffer.getvalue()
+                cache.put(key, output)
+            print(output, end="")
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,255 @@
+from itertools import count
+from typing import Iterable, Iterator
+
+from movie.movie import Movie
+from movie.search import TitleIndex
+from movie.timeseries import DateIndex
+
+# Conflict policies for movies with an rt_link that is already in the catalog
+KEEP_FIRST = "first"
+KEEP_LAST = "last"
+RAISE = "error"
+
+DUPLICATE_POLICIES = (KEEP_FIRST, KEEP_LAST, RAISE)
+
+# Versions are unique over all catalogs, so a version also identifies the catalog
+_versions = count()
+
+
+class MovieCatalog:
+    """
+        Collection of Movie objects with a primary-key index on rt_link.
+
+        The catalog can be used everywhere a list of movies is expected: it
+        supports len(), iteration and indexing in load order. It can only be
+        changed with add(); after changing a Movie object in place, call touch()
+        so cached reports and indexes are not used for the old data.
+
+        :_movies: Movies in load order.
+        :_positions: Dictionary mapping rt_link to the position in _movies.
+        :_search_index: TitleIndex over the movies, built on first use.
+        :_date_indexes: Dictionary mapping a date field to its DateIndex, built on first use.
+        :version: Changes every time a movie is stored or touched, so results computed
+                  for an older version can be recognized (see movie.cache).
+        :on_duplicate: What to do when a movie with an existing rt_link is added
+                       ("first" keeps the existing movie, "last" replaces it,
+                       "error" raises a ValueError).
+        """
+
+    def __init__(self, movies: Iterable[Movie] = None, on_duplicate: str = KEEP_FIRST) -> None:
+        """
+                :param movies: Optional movies to add to the catalog.
+                :param on_duplicate: Conflict policy for duplicate rt_links.
+                :raises ValueError: If the conflict policy is unknown.
+                """
+        if on_duplicate not in DUPLICATE_POLICIES:
+            raise ValueError(f"Unknown duplicate policy: {on_duplicate}")
+
+        self.on_duplicate = on_duplicate
+        self.version = next(_versions)
+        self._movies = []
+        self._positions = {}
+        self.duplicates = 0  # number of rows that hit an existing rt_link
+        self._search_index = None
+        self._date_indexes = {}
+
+        if movies is not None:
+            for movie in movies:
+                self.add(movie)
+
+    @property
+    def movies(self) -> tuple[Movie, ...]:
+        """
+                :return: The movies in load order, as a tuple: changing it does not change the catalog.
+                """
+        return tuple(self._movies)
+
+    def __repr__(self) -> str:
+        return f"MovieCatalog({len(self._movies)} movies)"
+
+    def __len__(self) -> int:
+        return len(self._movies)
+
+    def __iter__(self) -> Iterator[Movie]:
+        return iter(self._movies)
+
+    def __getitem__(self, index):
+        return self._movies[index]
+
+    def __contains__(self, rt_link: object) -> bool:
+        return rt_link in self._positions
+
+    def add(self, movie: Movie) -> bool:
+        """
+                Add a movie to the catalog, applying the conflict policy when its
+                rt_link is already present.
+
+                :param movie: Movie object to add
+                :return: True if the movie was stored, False if it was dropped
+                :raises ValueError: If the rt_link exists and the policy is "error"
+                """
+        position = self._positions.get(movie.rt_link)
+        if position is None:
+            self._positions[movie.rt_link] = len(self._movies)
+            self._movies.append(movie)
+            self.version = next(_versions)
+            if self._search_index is not None:
+                self._search_index.add(movie.rt_link, *_search_fields(movie))
+            self._date_indexes.clear()
+            return True
+
+        self.duplicates += 1
+        if self.on_duplicate == RAISE:
+            raise ValueError(f"Duplicate rt_link: {movie.rt_link}")
+        if self.on_duplicate == KEEP_FIRST:
+            return False
+
+        # KEEP_LAST: the new movie takes the place of the old one
+        self._movies[position] = movie
+        self.version = next(_versions)
+        if self._search_index is not None:
+            self._search_index.replace(movie.rt_link, *_search_fields(movie))
+        self._date_indexes.clear()
+        return True
+
+    def touch(self, movie: Movie = None) -> None:
+        """
+                Tell the catalog that movies were changed in place (e.g. a new score),
+                so it gets a new version and its indexes are rebuilt.
+
+                :param movie: The changed movie, or None when any movie may have changed
+                :raises KeyError: If the movie is not in the catalog (its rt_link must not change)
+                """
+        if movie is not None and self._movies[self._positions[movie.rt_link]] is not movie:
+            raise KeyError(movie.rt_link)
+
+        self.version = next(_versions)
+        if self._search_index is not None:
+            if movie is None:
+                self._search_index = None
+            else:
+                self._search_index.replace(movie.rt_link, *_search_fields(movie))
+        self._date_indexes.clear()
+
+    def get_movie(self, rt_link: str) -> Movie:
+        """
+                Retrieve a movie by its rt_link.
+
+                :param rt_link: The rotten tomatoes link (e.g. 'm/0814255')
+                :return: The Movie object with this rt_link
+                :raises KeyError: If no movie with this rt_link exists
+                """
+        return self._movies[self._positions[rt_link]]
+
+    def get_movies(self, rt_links: Iterable[str]) -> list[Movie]:
+        """
+                Retrieve the movies for a set of rt_links. Unknown links are ignored.
+
+                :param rt_links: The rt_links to look up
+                :return: List of Movie objects in the order of rt_links
+                """
+        movies = self._movies
+        positions = self._positions
+        return [movies[positions[link]] for link in rt_links if link in positions]
+
+    def select(self, rt_links: Iterable[str]) -> list[Movie]:
+        """
+                Retrieve the movies for a set of rt_links in load order. Unknown links are ignored.
+
+                :param rt_links: The rt_links to keep
+                :return: List of Movie objects in the order of the catalog
+                """
+        positions = self._positions
+        found = {positions[link] for link in rt_links if link in positions}
+        return [self._movies[position] for position in sorted(found)]
+
+    def links(self) -> list[str]:
+        """
+                :return: All rt_links in load order.
+                """
+        return [m.rt_link for m in self._movies]
+
+    @property
+    def search_index(self) -> TitleIndex:
+        """
+                :return: The TitleIndex of this catalog, built on first use.
+                """
+        if self._search_index is None:
+            index = TitleIndex()
+            for movie in self._movies:
+                index.add(movie.rt_link, *_search_fields(movie))
+            self._search_index = index
+        return self._search_index
+
+    def search(self, query: str, limit: int = 10, include_others: bool = True) -> list[Movie]:
+        """
+                Find movies by title, director or company name, ignoring case and accents.
+
+                :param query: Search text; the last word may be incomplete
+                :param limit: Maximum number of results
+                :param include_others: Also match director and company names
+                :return: List of Movie objects, best match first
+                """
+        return self.get_movies(self.search_index.search(query, limit, include_others))
+
+    def autocomplete(self, text: str, limit: int = 10) -> list[Movie]:
+        """
+                Find movies whose title starts with the given text.
+
+                :param text: Start of the title
+                :param limit: Maximum number of results
+                :return: List of Movie objects in alphabetical order of title
+                """
+        return self.get_movies(self.search_index.prefix(text, limit))
+
+    def save_search_index(self, filename: str) -> None:
+        """
+                Save the search index, so a later run can load it instead of rebuilding it.
+                A fingerprint of the indexed fields is saved with it.
+
+                :param filename: Path of the file to write
+                """
+        index = self.search_index
+        index.fingerprint = self._search_fingerprint()
+        index.save(filename)
+
+    def load_search_index(self, filename: str) -> None:
+        """
+                Load a search index saved with save_search_index(). The file is
+                unpickled, so only load files from a trusted source.
+
+                :param filename: Path of the file to read
+                :raises ValueError: If the index was built from other movies, or from
+                                    movies with another title, director or company
+                """
+        index = TitleIndex.load(filename)
+        if index.keys != self.links() or index.fingerprint != self._search_fingerprint():
+            raise ValueError(f"Search index {filename} does not match this catalog.")
+        self._search_index = index
+
+    def _search_fingerprint(self) -> str:
+        # hash of the searchable fields of every movie, in load order
+        import hashlib  # only needed to save or load an index
+
+        digest = hashlib.sha256()
+        for movie in self._movies:
+            title, others = _search_fields(movie)
+            digest.update("\x1f".join([movie.rt_link, title, *(other or "" for other in others)]).encode())
+            digest.update(b"\x1e")
+        return digest.hexdigest()
+
+    def date_index(self, field: str = "release_date") -> DateIndex:
+        """
+                :param field: "release_date" or "streaming_date"
+                :return: The DateIndex of this catalog on the field, built on first use.
+                """
+        if field not in self._date_indexes:
+            self._date_indexes[field] = DateIndex(self._movies, field)
+        return self._date_indexes[field]
+
+
+def _search_fields(movie: Movie) -> tuple[str, list[str]]:
+    # the title and the other searchable names of a movie
+    others = [d.fullname for d in movie.directors]
+    others.append(movie.company)
+    return movie.title, others
@@ -0,0 +1,152 @@
+from array import array
+from collections.abc import Iterable
+
+
+class StringTable:
+    """
+        Dictionary encoding for a string column with few distinct values: every
+        distinct string is stored once and gets a small integer code.
+
+        :values: The distinct strings; the position in this list is the code.
+        :_codes: Dictionary mapping a string to its code.
+        """
+
+    def __init__(self, values: Iterable[str] = ()) -> None:
+        self.values = []
+        self._codes = {}
+        for value in values:
+            self.encode(value)
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def __repr__(self) -> str:
+        return f"StringTable({len(self.values)} values)"
+
+    def encode(self, value: str) -> int:
+        """
+                :param value: String to encode
+                :return: The code of the string, a new code if it was not in the table yet
+                """
+        code = self._codes.get(value)
+        if code is None:
+            code = len(self.values)
+            self._codes[value] = code
+            self.values.append(value)
+        return code
+
+    def decode(self, code: int) -> str:
+        """
+                :param code: Code returned by encode()
+                :return: The string with this code
+                """
+        return self.values[code]
+
+    def intern(self, value: str) -> str:
+        """
+                Return the shared copy of a string, so equal strings are stored only once.
+
+                :param value: String to intern (None is returned unchanged)
+                :return: The string object stored in the table
+                """
+        if value is None:
+            return None
+        return self.values[self.encode(value)]
+
+
+# Shared table for Movie.company, filled by create_movie
+COMPANIES = StringTable()
+
+
+def encode_column(values: Iterable[str], table: StringTable = None) -> tuple[array, StringTable]:
+    """
+        Encode a column of strings as an array of integer codes. A new table reserves
+        code 0 for None.
+
+        :param values: The strings of the column
+        :param table: Table to add the strings to; a new table when None
+        :return: Tuple of the code array and the table with the strings
+        """
+    if table is None:
+        table = StringTable()
+    if not table.values:
+        table.encode(None)  # code 0 stands for a missing value
+    codes = array("I", (table.encode(value) for value in values))
+    if len(table) <= 0x10000:
+        codes = array("H", codes)  # two bytes per row is enough
+    return codes, table
+
+
+def decode_column(codes: array, table: StringTable) -> list[str]:
+    """
+        :return: The strings of a column encoded with encode_column().
+        """
+    values = table.values
+    return [values[code] for code in codes]
+
+
+def _copy(value: str) -> str:
+    # a new string object with the same text, like csv.DictReader returns for every row
+    return (value + ".")[:-1] if value else value
+
+
+def _measure(build) -> tuple[object, int]:
+    import tracemalloc  # profiling only, kept out of the import of movie.movie
+
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = build()
+    size = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    return result, size
+
+
+def memory_report(filename: str, scale: int = 100) -> dict[str, tuple[int, int]]:
+    """
+        Measure with tracemalloc the memory of a loaded catalog with a string object
+        per company (plain) and with the companies interned in a StringTable
+        (encoded, as create_movie does), including the strings of the table. The
+        rows of the CSV file are repeated scale times to simulate a large catalog.
+
+        :param filename: Path to the CSV file containing movie data
+        :param scale: Number of times the rows are repeated
+        :return: Dictionary mapping "catalog" and "per movie" to a tuple
+                 (bytes plain, bytes encoded)
+        """
+    import csv
+
+    from movie.catalog import MovieCatalog
+    from movie.movie import create_movie
+
+    with open(filename, newline="", encoding="latin1") as csvfile:
+        rows = []
+        for row in csv.DictReader(csvfile):
+            try:
+                # also creates the shared directors and ratings before measuring
+                create_movie(row, companies=None)
+            except Exception:
+                continue  # skipped, like load_movies does
+            rows.append(row)
+    rows = [{**row, "rotten_tomatoes_link": f"{row['rotten_tomatoes_link']}-{i}"}
+            for i in range(scale) for row in rows]  # keep links unique
+
+    def load(companies: StringTable) -> MovieCatalog:
+        # fresh strings for every row, like reading the file again
+        return MovieCatalog(create_movie({key: _copy(value) for key, value in row.items()},
+                                         companies=companies) for row in rows)
+
+    catalog, plain = _measure(lambda: load(None))
+    del catalog
+    catalog, encoded = _measure(lambda: load(StringTable()))
+    count = max(len(catalog), 1)
+    return {"catalog": (plain, encoded), "per movie": (plain // count, encoded // count)}
+
+
+if __name__ == "__main__":
+    import sys
+
+    csv_file = sys.argv[1] if len(sys.argv) > 1 else "reviews.csv"
+    times = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+    print(f"{'Measure':<15}{'Plain':>14}{'Encoded':>14}{'Saved':>14}")
+    for measure, (plain_bytes, encoded_bytes) in memory_report(csv_file, times).items():
+        print(f"{measure:<15}{plain_bytes:>14,}{encoded_bytes:>14,}{plain_bytes - encoded_bytes:>14,}")
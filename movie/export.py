@@ -0,0 +1,269 @@
+from datetime import date
+from itertools import islice
+from typing import Iterable, Iterator
+
+from movie.encoding import StringTable, encode_column
+from movie.movie import Movie
+
+# Value of a missing length, score or count in NumPy output (NumPy integers have no None)
+MISSING = -1
+
+BATCH_SIZE = 10_000
+
+# String columns with few distinct values, stored as codes with encode_strings=True
+ENCODED_FIELDS = ("rating", "genre", "company")
+
+_EPOCH = date(1970, 1, 1).toordinal()
+
+
+def _batches(movies: Iterable[Movie], batch_size: int) -> Iterator[list[Movie]]:
+    if batch_size < 1:
+        raise ValueError("batch_size must be at least 1.")
+    iterator = iter(movies)
+    while True:
+        batch = list(islice(iterator, batch_size))
+        if not batch:
+            return
+        yield batch
+
+
+def _days(day: date) -> int:
+    # days since 1970-01-01, the unit of datetime64[D] and of Arrow date32
+    return day.toordinal() - _EPOCH
+
+
+def _genre(movie: Movie) -> str:
+    return type(movie).__name__
+
+
+def _string(movie: Movie, field: str) -> str:
+    if field == "rating":
+        return movie.rating.code
+    if field == "genre":
+        return _genre(movie)
+    return getattr(movie, field)
+
+
+def _require(module: str):
+    try:
+        return __import__(module)
+    except ImportError:
+        raise ImportError(f"{module} is required for this export; install it with 'pip install {module}'.") from None
+
+
+# =====================
+# NumPy
+# =====================
+def to_numpy(movies: Iterable[Movie], batch_size: int = BATCH_SIZE, encode_strings: bool = False) -> dict:
+    """
+        Convert movies to NumPy arrays, filled in batches.
+
+        The "movies" array is a structured array with one row per movie: strings
+        as fixed-width unicode, dates as datetime64[D] (NaT when missing) and
+        length, score and count as integers (MISSING when missing). Directors are
+        a list per movie, stored as a flat "directors" array; the directors of
+        movie i are directors[director_offsets[i]:director_offsets[i + 1]].
+
+        With encode_strings, rating, genre and company are stored as unsigned integer
+        codes instead of fixed-width strings; the strings are in the arrays
+        "rating_values", "genre_values" and "company_values" ("" for code 0, a missing value).
+
+        :param movies: MovieCatalog or list of Movie objects
+        :param batch_size: Number of movies converted at a time
+        :param encode_strings: Store rating, genre and company as codes
+        :return: Dictionary with the arrays "movies", "directors" and "director_offsets",
+                 and the value arrays of the encoded columns
+        """
+    np = _require("numpy")
+
+    if not hasattr(movies, "__len__"):
+        movies = list(movies)
+
+    encoded = {}
+    if encode_strings:
+        for field in ENCODED_FIELDS:
+            encoded[field] = encode_column(_string(m, field) for m in movies)
+
+    # first pass: sizes, so every array is allocated once
+    widths = {field: 1 for field in ("rt_link", "title", "rating", "genre", "company") if field not in encoded}
+    director_width = 1
+    director_count = 0
+    for m in movies:
+        for field in widths:
+            widths[field] = max(widths[field], len(_string(m, field) or ""))
+        director_count += len(m.directors)
+        for d in m.directors:
+            director_width = max(director_width, len(d.fullname))
+
+    def string_type(field: str) -> str:
+        if field in encoded:
+            return "uint16" if encoded[field][0].typecode == "H" else "uint32"
+        return f"U{widths[field]}"
+
+    dtype = np.dtype([
+        ("rt_link", string_type("rt_link")),
+        ("title", string_type("title")),
+        ("rating", string_type("rating")),
+        ("genre", string_type("genre")),
+        ("release_date", "datetime64[D]"),
+        ("streaming_date", "datetime64[D]"),
+        ("length", "int32"),
+        ("company", string_type("company")),
+        ("score", "int32"),
+        ("count", "int64"),
+    ])
+    table = np.empty(len(movies), dtype=dtype)
+    directors = np.empty(director_count, dtype=f"U{director_width}")
+    offsets = np.zeros(len(movies) + 1, dtype="int64")
+    nat = np.iinfo(np.int64).min
+
+    # second pass: fill the arrays one batch at a time
+    row = 0
+    director_row = 0
+    for batch in _batches(movies, batch_size):
+        end = row + len(batch)
+        rows = table[row:end]
+        for field in widths:
+            rows[field] = [_string(m, field) or "" for m in batch]
+        for field in ("release_date", "streaming_date"):
+            days = [nat if getattr(m, field) is None else _days(getattr(m, field)) for m in batch]
+            rows[field] = np.array(days, dtype="int64").view("datetime64[D]")
+        rows["length"] = [MISSING if m.length is None else m.length for m in batch]
+        rows["score"] = [MISSING if m.score is None else m.score for m in batch]
+        rows["count"] = [MISSING if m.count is None else m.count for m in batch]
+
+        names = [d.fullname for m in batch for d in m.directors]
+        directors[director_row:director_row + len(names)] = names
+        offsets[row + 1:end + 1] = director_row + np.cumsum([len(m.directors) for m in batch])
+        director_row += len(names)
+        row = end
+
+    arrays = {"movies": table, "directors": directors, "director_offsets": offsets}
+    for field, (codes, strings) in encoded.items():
+        table[field] = np.frombuffer(codes, dtype=dtype[field])
+        arrays[f"{field}_values"] = np.array([value or "" for value in strings.values])
+    return arrays
+
+
+def export_npz(movies: Iterable[Movie], filename: str, batch_size: int = BATCH_SIZE,
+               encode_strings: bool = False) -> None:
+    """
+        Export movies to a compressed NumPy .npz file with the arrays of to_numpy().
+        Load it with numpy.load(filename).
+
+        :param movies: MovieCatalog or list of Movie objects
+        :param filename: Path of the .npz file to write
+        :param batch_size: Number of movies converted at a time
+        :param encode_strings: Store rating, genre and company as codes
+        :return: None
+        """
+    np = _require("numpy")
+    np.savez_compressed(filename, **to_numpy(movies, batch_size, encode_strings))
+
+
+# =====================
+# Arrow / Parquet
+# =====================
+def arrow_schema(encode_strings: bool = False):
+    """
+        :param encode_strings: Use dictionary columns for rating, genre and company
+        :return: The pyarrow schema of the Arrow and Parquet exports.
+        """
+    pa = _require("pyarrow")
+    string = pa.dictionary(pa.int32(), pa.string()) if encode_strings else pa.string()
+    return pa.schema([
+        ("rt_link", pa.string()),
+        ("title", pa.string()),
+        ("rating", string),
+        ("genre", string),
+        ("directors", pa.list_(pa.string())),
+        ("release_date", pa.date32()),
+        ("streaming_date", pa.date32()),
+        ("length", pa.int32()),
+        ("company", string),
+        ("score", pa.int32()),
+        ("count", pa.int64()),
+    ])
+
+
+def to_arrow_batches(movies: Iterable[Movie], batch_size: int = BATCH_SIZE,
+                     encode_strings: bool = False) -> Iterator:
+    """
+        Convert movies to pyarrow record batches. Missing values are null.
+
+        With encode_strings, rating, genre and company are dictionary columns. The
+        dictionary of a batch extends the one of the previous batch, so a writer
+        only has to emit the new strings (a dictionary delta).
+
+        :param movies: MovieCatalog, list or iterator of Movie objects
+        :param batch_size: Number of movies per record batch
+        :param encode_strings: Use dictionary columns for rating, genre and company
+        :return: Iterator of pyarrow.RecordBatch
+        """
+    pa = _require("pyarrow")
+    schema = arrow_schema(encode_strings)
+    tables = {field: StringTable() for field in ENCODED_FIELDS} if encode_strings else {}
+
+    for batch in _batches(movies, batch_size):
+        columns = {
+            "rt_link": [m.rt_link for m in batch],
+            "title": [m.title for m in batch],
+            "rating": [m.rating.code for m in batch],
+            "genre": [_genre(m) for m in batch],
+            "directors": [[d.fullname for d in m.directors] for m in batch],
+            "release_date": [None if m.release_date is None else _days(m.release_date) for m in batch],
+            "streaming_date": [None if m.streaming_date is None else _days(m.streaming_date) for m in batch],
+            "length": [m.length for m in batch],
+            "company": [m.company for m in batch],
+            "score": [m.score for m in batch],
+            "count": [m.count for m in batch],
+        }
+        for field, strings in tables.items():
+            codes, _ = encode_column(columns[field], strings)
+            columns[field] = pa.DictionaryArray.from_arrays(
+                pa.array([code or None for code in codes], pa.int32()),  # code 0 is null
+                pa.array([value or "" for value in strings.values], pa.string()))
+        arrays = [columns[field.name] if field.name in tables else pa.array(columns[field.name], type=field.type)
+                  for field in schema]
+        yield pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+
+def export_parquet(movies: Iterable[Movie], filename: str, batch_size: int = BATCH_SIZE,
+                   encode_strings: bool = False) -> None:
+    """
+        Export movies to a Parquet file, one row group per batch. Needs pyarrow.
+
+        :param movies: MovieCatalog, list or iterator of Movie objects
+        :param filename: Path of the .parquet file to write
+        :param batch_size: Number of movies per row group
+        :param encode_strings: Store rating, genre and company as dictionary columns
+        :return: None
+        :raises ImportError: If pyarrow is not installed
+        """
+    _require("pyarrow")
+    import pyarrow.parquet as pq
+
+    with pq.ParquetWriter(filename, arrow_schema(encode_strings)) as writer:
+        for batch in to_arrow_batches(movies, batch_size, encode_strings):
+            writer.write_batch(batch)
+
+
+def export_arrow(movies: Iterable[Movie], filename: str, batch_size: int = BATCH_SIZE,
+                 encode_strings: bool = False) -> None:
+    """
+        Export movies to an Arrow IPC (Feather v2) file. Needs pyarrow.
+
+        :param movies: MovieCatalog, list or iterator of Movie objects
+        :param filename: Path of the .arrow file to write
+        :param batch_size: Number of movies per record batch
+        :param encode_strings: Store rating, genre and company as dictionary columns
+        :return: None
+        :raises ImportError: If pyarrow is not installed
+        """
+    pa = _require("pyarrow")
+
+    with pa.OSFile(filename, "wb") as sink:
+        options = pa.ipc.IpcWriteOptions(emit_dictionary_deltas=True)
+        with pa.ipc.new_file(sink, arrow_schema(encode_strings), options=options) as writer:
+            for batch in to_arrow_batches(movies, batch_size, encode_strings):
+                writer.write_batch(batch)
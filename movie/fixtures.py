@@ -0,0 +1,44 @@
+"""
+Shared test data for the tests of the movie package.
+"""
+from typing import Iterable
+
+from movie.catalog import MovieCatalog
+from movie.movie import Movie, create_movie
+
+# One CSV row, as read by csv.DictReader in load_movies
+MOVIE_INFO = {
+    "rotten_tomatoes_link": "m/1000640-all_of_me",
+    "movie_title": "All of Me",
+    "content_rating": "PG",
+    "genre": "COMEDY",
+    "directors": "Carl Reiner",
+    "original_release_date": "1984-09-21",
+    "streaming_release_date": "2016-10-30",
+    "runtime": "93",
+    "production_company": "HBO Video",
+    "audience_rating": "67",
+    "audience_count": "14346"
+}
+
+
+def make_movie(rt_link: str = MOVIE_INFO["rotten_tomatoes_link"], **fields: str) -> Movie:
+    """
+        Create a movie from MOVIE_INFO with some fields changed.
+
+        :param rt_link: Value of rotten_tomatoes_link
+        :param fields: Other CSV fields to change, e.g. movie_title="Big"
+        :return: Movie object
+        """
+    info = MOVIE_INFO.copy()
+    info["rotten_tomatoes_link"] = rt_link
+    info.update(fields)
+    return create_movie(info)
+
+
+def make_catalog(rows: Iterable[dict]) -> MovieCatalog:
+    """
+        :param rows: Arguments of make_movie() for every movie
+        :return: MovieCatalog of the created movies
+        """
+    return MovieCatalog(make_movie(**row) for row in rows)
@@ -1,6 +1,7 @@
 from abc import ABC
 from datetime import datetime
 
+from movie.encoding import COMPANIES, StringTable
 from movie.rating import MovieRating, get_rating
 from person.person import Person, get_person
 
@@ -60,11 +61,13 @@ class Movie(ABC):
             and self.count >= 100
         )
 
-    def is_classic(self) -> bool:
+    def is_classic(self, now: datetime = None) -> bool:
         if self.release_date is None:
             return False
 
-        age = datetime.now().year - self.release_date.year
+        if now is None:
+            now = datetime.now()
+        age = now.year - self.release_date.year
         return age >= 20 and self.relevant_score() and self.score > 80
 
     def is_short(self) -> bool:
@@ -106,29 +109,27 @@ class Horror(Movie):
         return self.rating > get_rating("PG")
 
 
-#factory function
-from datetime import datetime
+# Movie subclass per genre value in the CSV file
+GENRE_CLASSES = {
+    "ACTION & ADVENTURE": ActionAdventure,
+    "COMEDY": Comedy,
+    "DRAMA": Drama,
+    "HORROR": Horror,
+    "ROMANCE": Romance,
+    "SCIENCE FICTION & FANTASY": ScienceFictionFantasy,
+    "WESTERN": Western,
+}
 
-def create_movie(movie_info: dict) -> Movie:
+
+#factory function
+def create_movie(movie_info: dict, director_threshold: float = None,
+                 companies: StringTable = COMPANIES) -> Movie:
     # Read the genre from CSV
     genre = movie_info["genre"]
 
-    # select the correct subclass using if-elif
-    if genre == "ACTION & ADVENTURE":
-        movie_class = ActionAdventure
-    elif genre == "COMEDY":
-        movie_class = Comedy
-    elif genre == "DRAMA":
-        movie_class = Drama
-    elif genre == "HORROR":
-        movie_class = Horror
-    elif genre == "ROMANCE":
-        movie_class = Romance
-    elif genre == "SCIENCE FICTION & FANTASY":
-        movie_class = ScienceFictionFantasy
-    elif genre == "WESTERN":
-        movie_class = Western
-    else:
+    # select the correct subclass from the genre table
+    movie_class = GENRE_CLASSES.get(genre)
+    if movie_class is None:
         raise ValueError(f"Unknown genre: {genre}")
 
 
@@ -140,7 +141,7 @@ def create_movie(movie_info: dict) -> Movie:
     if movie_info.get("directors"):
         names = movie_info["directors"].split(",")
         for name in names:
-            directors.append(get_person(name.strip()))
+            directors.append(get_person(name.strip(), director_threshold))
 
     #  convert numeric values
     score = int(movie_info["audience_rating"]) if movie_info.get("audience_rating") else None
@@ -169,7 +170,8 @@ def create_movie(movie_info: dict) -> Movie:
         release_date=release_date,
         streaming_date=streaming_date,
         length=length,
-        company=movie_info.get("production_company"),
+        company=(movie_info.get("production_company") if companies is None
+                 else companies.intern(movie_info.get("production_company"))),
         score=score,
         count=count,
     )
@@ -0,0 +1,107 @@
+from datetime import datetime
+from typing import Iterable
+
+from movie.movie import Movie, Comedy, Horror, Romance
+from movie.rating import MovieRating
+
+PREDICATES = ("classic", "short", "cosy", "slapstick", "scary")
+
+# Predicates that can only be True for one genre
+_GENRES = {"cosy": Romance, "slapstick": Comedy, "scary": Horror}
+
+
+def evaluate(movies: Iterable[Movie], names: Iterable[str] = PREDICATES,
+             now: datetime = None) -> dict[str, list[bool]]:
+    """
+        Evaluate movie predicates over a whole collection in one pass.
+
+        The result matches calling is_classic(), is_short(), is_cosy(),
+        is_slapstick() and is_scary() on every movie, but "now" is read once
+        for the whole query and genre-specific predicates are False for movies
+        of another genre.
+
+        :param movies: MovieCatalog or list of Movie objects
+        :param names: Predicates to evaluate (see PREDICATES)
+        :param now: Reference time for is_classic, defaults to datetime.now()
+        :return: Dictionary mapping each predicate name to a boolean mask
+        :raises ValueError: If a predicate name is unknown
+        """
+    names = tuple(names)
+    for name in names:
+        if name not in PREDICATES:
+            raise ValueError(f"Unknown predicate: {name}")
+
+    # captured once per query instead of once per movie
+    classic_year = (now if now is not None else datetime.now()).year - 20
+    order = MovieRating._order
+    pg_order = order["PG"]
+
+    classic = [] if "classic" in names else None
+    short = [] if "short" in names else None
+    cosy = [] if "cosy" in names else None
+    slapstick = [] if "slapstick" in names else None
+    scary = [] if "scary" in names else None
+
+    for m in movies:
+        # type() instead of isinstance(): Movie is an ABC, and ABC instance checks
+        # are slow; the genre classes have no subclasses
+        cls = type(m)
+        if classic is not None:
+            classic.append(
+                m.release_date is not None
+                and m.release_date.year <= classic_year
+                and m.score is not None and m.count is not None and m.count >= 100
+                and m.score > 80
+            )
+        if short is not None:
+            short.append(m.length is not None and m.length < 30)
+        if cosy is not None:
+            cosy.append(cls is Romance and m.length is not None and 70 <= m.length <= 100)
+        if slapstick is not None:
+            slapstick.append(cls is Comedy and m.score is not None and m.count is not None
+                             and m.count >= 100 and m.score < 40)
+        if scary is not None:
+            scary.append(cls is Horror and order[m.rating.code] > pg_order)
+
+    masks = {"classic": classic, "short": short, "cosy": cosy,
+             "slapstick": slapstick, "scary": scary}
+    return {name: masks[name] for name in names}
+
+
+def mask(movies: Iterable[Movie], name: str, now: datetime = None) -> list[bool]:
+    """
+        Evaluate a single predicate over a collection of movies.
+
+        :param movies: MovieCatalog or list of Movie objects
+        :param name: Predicate name (see PREDICATES)
+        :param now: Reference time for is_classic, defaults to datetime.now()
+        :return: Boolean mask with one entry per movie
+        """
+    return evaluate(movies, (name,), now)[name]
+
+
+def indices(values: list[bool]) -> list[int]:
+    """
+        Convert a boolean mask to the positions where it is True.
+
+        :param values: Boolean mask
+        :return: List of positions
+        """
+    return [i for i, value in enumerate(values) if value]
+
+
+def select(movies: Iterable[Movie], name: str, now: datetime = None) -> list[Movie]:
+    """
+        Return the movies for which a predicate is True, in their original order.
+
+        :param movies: MovieCatalog or list of Movie objects
+        :param name: Predicate name (see PREDICATES)
+        :param now: Reference time for is_classic, defaults to datetime.now()
+        :return: List of Movie objects
+        """
+    genre = _GENRES.get(name)
+    if genre is None:
+        movies = list(movies)
+    else:
+        movies = [m for m in movies if type(m) is genre]  # only evaluate the movies of the genre
+    return [m for m, value in zip(movies, mask(movies, name, now)) if value]
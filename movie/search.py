@@ -0,0 +1,358 @@
+import heapq
+import re
+import unicodedata
+from bisect import bisect_left, insort
+from itertools import chain, islice
+from typing import Iterable, Iterator
+
+_TOKEN = re.compile(r"\w+")
+
+# A last query word that is still being typed is completed to at most this many
+# indexed words, the ones that occur most often
+MAX_COMPLETIONS = 50
+# Posting lists up to this many times longer than the current candidates are
+# intersected as sets, longer ones are probed with a binary search per candidate
+INTERSECT_RATIO = 16
+# Smallest number of candidates that is checked at a time when walking the rarest word
+MIN_CHUNK = 64
+
+
+def fold(text: str) -> str:
+    """
+        Fold a string for searching: remove accents and ignore case.
+
+        :param text: Text to fold
+        :return: Folded text (e.g. 'Amélie' -> 'amelie')
+        """
+    decomposed = unicodedata.normalize("NFKD", text)
+    return "".join(c for c in decomposed if not unicodedata.combining(c)).casefold()
+
+
+def _unique(docs: Iterable[int]) -> Iterator[int]:
+    # drop repeated ids from a sorted stream
+    previous = None
+    for doc in docs:
+        if doc != previous:
+            yield doc
+            previous = doc
+
+
+def _size(lists: list[list[int]]) -> int:
+    return sum(len(docs) for docs in lists)
+
+
+def _contains(docs: list[int], doc: int) -> bool:
+    # membership test on a sorted posting list
+    position = bisect_left(docs, doc)
+    return position < len(docs) and docs[position] == doc
+
+
+def _intersect(docs: list[int], groups: list[list[list[int]]]) -> list[int]:
+    # the sorted documents that are in at least one list of every group
+    for lists in groups:
+        if not docs:
+            break
+        if _size(lists) <= INTERSECT_RATIO * len(docs):
+            docs = sorted(set(docs).intersection(chain.from_iterable(lists)))
+        else:
+            docs = [doc for doc in docs if any(_contains(l, doc) for l in lists)]
+    return docs
+
+
+def _walk(docs: Iterator[int], groups: list[list[list[int]]], chunk: int) -> Iterator[int]:
+    # intersect the sorted documents with every group a chunk at a time: only the
+    # part of each posting list between the first and last document of the chunk
+    # is read (or probed, when that part is long), and the chunks grow while the
+    # matches are few
+    while True:
+        block = list(islice(docs, chunk))
+        if not block:
+            return
+        low, high = block[0], block[-1] + 1
+        keep = set(block)
+        for lists in groups:
+            found = set()
+            for l in lists:
+                start, end = bisect_left(l, low), bisect_left(l, high)
+                if end - start <= INTERSECT_RATIO * len(keep):
+                    found.update(l[start:end])
+                else:  # a dense list: probe it for each remaining document
+                    for doc in keep:
+                        position = bisect_left(l, doc, start, end)
+                        if position < end and l[position] == doc:
+                            found.add(doc)
+            keep &= found
+            if not keep:
+                break
+        yield from sorted(keep)
+        chunk *= 4
+
+
+def tokenize(text: str) -> list[str]:
+    """
+        Split a text into folded search tokens.
+
+        :param text: Text to split
+        :return: List of tokens
+        """
+    return _TOKEN.findall(fold(text))
+
+
+class TitleIndex:
+    """
+        In-memory search index over movie titles, and optionally over director and
+        company names.
+
+        A search returns the movies that contain every query word; the last word may
+        be the start of a word, so the search works while typing. Results are ranked
+        in tiers:
+            1. the title starts with the query (alphabetical, so an equal title comes first);
+            2. every query word is in the title (in the order the movies were added);
+            3. every query word is in the title or in another field (same order).
+        The rarest query word is used to generate the candidates, which are checked
+        against the other words one by one, and the search stops as soon as it has
+        enough results, so common words do not make it slow.
+
+        The index only stores strings and integers, so it can be saved next to
+        the data it was built from and loaded again without rebuilding.
+
+        :keys: rt_link of each indexed movie; the position in this list is the document id.
+        :_docs: Dictionary mapping a key to its document id.
+        :_titles: Normalized title of each document (folded tokens joined by a space).
+        :_others: Normalized other names of each document (directors, company).
+        :_title_postings: Dictionary mapping a token to the sorted document ids with that
+                          token in the title.
+        :_other_postings: Dictionary mapping a token to the sorted document ids with that
+                          token in another field.
+        :_sorted_titles: Sorted (normalized title, document id) pairs, used for prefix search.
+        :_sorted_tokens: All tokens in sorted order, used to complete the last query word.
+        :fingerprint: Set by the owner of the index to identify the data it was built
+                      from, so a saved index can be checked when it is loaded.
+        """
+
+    def __init__(self) -> None:
+        self.keys = []
+        self._docs = {}
+        self._titles = []
+        self._others = []
+        self._title_postings = {}
+        self._other_postings = {}
+        # sorted once on the first query, then kept sorted by add() and replace()
+        self._sorted_titles = None
+        self._sorted_tokens = None
+        self.fingerprint = None
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def add(self, key: str, title: str, others: Iterable[str] = ()) -> None:
+        """
+                Add a document to the index.
+
+                :param key: Key of the document (the rt_link)
+                :param title: Title of the movie
+                :param others: Other searchable names (directors, company)
+                :raises ValueError: If the key is already in the index
+                """
+        if key in self._docs:
+            raise ValueError(f"{key} is already in the index.")
+
+        doc = len(self.keys)
+        self.keys.append(key)
+        self._docs[key] = doc
+        self._titles.append("")
+        self._others.append("")
+        self._store(doc, title, others)
+
+    def replace(self, key: str, title: str, others: Iterable[str] = ()) -> None:
+        """
+                Replace the title and other names of a document that is already in the index.
+
+                :param key: Key of the document (the rt_link)
+                :param title: New title of the movie
+                :param others: New other searchable names (directors, company)
+                :raises KeyError: If the key is not in the index
+                """
+        doc = self._docs[key]
+        for token in set(self._titles[doc].split()):
+            self._unpost(self._title_postings, token, doc)
+        for token in set(self._others[doc].split()):
+            self._unpost(self._other_postings, token, doc)
+        if self._sorted_titles is not None:
+            del self._sorted_titles[bisect_left(self._sorted_titles, (self._titles[doc], doc))]
+        self._store(doc, title, others)
+
+    def _store(self, doc: int, title: str, others: Iterable[str]) -> None:
+        title_tokens = tokenize(title)
+        other_tokens = []
+        for other in others:
+            if other:
+                other_tokens.extend(tokenize(other))
+
+        self._titles[doc] = " ".join(title_tokens)
+        self._others[doc] = " ".join(other_tokens)
+        for token in set(title_tokens):
+            self._post(self._title_postings, token, doc)
+        for token in set(other_tokens):
+            self._post(self._other_postings, token, doc)
+        if self._sorted_titles is not None:
+            insort(self._sorted_titles, (self._titles[doc], doc))
+
+    def _post(self, postings: dict, token: str, doc: int) -> None:
+        docs = postings.get(token)
+        if docs is None:
+            if (self._sorted_tokens is not None and token not in self._title_postings
+                    and token not in self._other_postings):
+                insort(self._sorted_tokens, token)
+            postings[token] = [doc]
+        elif docs[-1] < doc:
+            docs.append(doc)
+        else:
+            insort(docs, doc)  # a replaced document keeps its (lower) id
+
+    def _unpost(self, postings: dict, token: str, doc: int) -> None:
+        docs = postings[token]
+        del docs[bisect_left(docs, doc)]
+        if not docs:
+            del postings[token]
+            if (self._sorted_tokens is not None and token not in self._title_postings
+                    and token not in self._other_postings):
+                del self._sorted_tokens[bisect_left(self._sorted_tokens, token)]
+
+    def _prepare(self) -> None:
+        if self._sorted_titles is None:
+            self._sorted_titles = sorted(zip(self._titles, range(len(self._titles))))
+        if self._sorted_tokens is None:
+            self._sorted_tokens = sorted(self._title_postings.keys() | self._other_postings.keys())
+
+    def _frequency(self, token: str) -> int:
+        return len(self._title_postings.get(token, ())) + len(self._other_postings.get(token, ()))
+
+    def _complete(self, prefix: str) -> list[str]:
+        """
+                :return: The indexed tokens that start with prefix, at most MAX_COMPLETIONS
+                         of them (the most frequent ones).
+                """
+        tokens = self._sorted_tokens
+        start = bisect_left(tokens, prefix)
+        end = bisect_left(tokens, prefix + "\U0010ffff", start)
+        if end - start <= MAX_COMPLETIONS:
+            return tokens[start:end]
+        return heapq.nlargest(MAX_COMPLETIONS, tokens[start:end], key=self._frequency)
+
+    def _candidates(self, words: list[str], last: str, include_others: bool, limit: int) -> Iterator[int]:
+        """
+                :return: In increasing order, the documents that contain every query word.
+                """
+        postings = [self._title_postings]
+        if include_others:
+            postings.append(self._other_postings)
+
+        # each group lists the documents of one query word, the last one completed
+        groups = [[p[word] for p in postings if word in p] for word in words]
+        groups.append([p[token] for token in self._complete(last) for p in postings if token in p])
+        groups.sort(key=_size)
+
+        rarest, *others = groups
+        docs = iter(rarest[0]) if len(rarest) == 1 else _unique(heapq.merge(*rarest))
+        if not others:
+            return docs
+        if limit >= _size(rarest):
+            return iter(_intersect(list(docs), others))  # every document is needed anyway
+
+        # walk the rarest word lazily, so the search stops once it has enough results
+        return _walk(docs, others, max(2 * limit, MIN_CHUNK))
+
+    def search(self, query: str, limit: int = 10, include_others: bool = True) -> list[str]:
+        """
+                Find the movies that best match a query, see the ranking in the class docstring.
+
+                :param query: Search text
+                :param limit: Maximum number of results
+                :param include_others: Also match director and company names
+                :return: List of keys, best match first
+                """
+        tokens = tokenize(query)
+        if not tokens or limit <= 0:
+            return []
+        self._prepare()
+
+        results = []
+        seen = set()
+
+        # tier 1: titles that start with the query, straight from the sorted titles
+        normalized = " ".join(tokens)
+        titles = self._sorted_titles
+        position = bisect_left(titles, (normalized,))
+        while position < len(titles) and len(results) < limit:
+            title, doc = titles[position]
+            if not title.startswith(normalized):
+                break
+            results.append(doc)
+            seen.add(doc)
+            position += 1
+
+        # tiers 2 and 3: every query word in the title, then in the title or other names
+        *words, last = tokens
+        for others in ((False, True) if include_others else (False,)):
+            if len(results) >= limit:
+                break
+            for doc in self._candidates(words, last, others, limit - len(results)):
+                if doc not in seen:
+                    results.append(doc)
+                    seen.add(doc)
+                    if len(results) >= limit:
+                        break
+
+        return [self.keys[doc] for doc in results]
+
+    def prefix(self, text: str, limit: int = 10) -> list[str]:
+        """
+                Find the movies whose title starts with the given text, for autocomplete.
+
+                :param text: Start of the title
+                :param limit: Maximum number of results
+                :return: List of keys in alphabetical order of title
+                """
+        normalized = " ".join(tokenize(text))
+        if not normalized or limit <= 0:
+            return []
+        self._prepare()
+        titles = self._sorted_titles
+        start = bisect_left(titles, (normalized,))
+        keys = []
+        for title, doc in titles[start:start + limit]:
+            if not title.startswith(normalized):
+                break
+            keys.append(self.keys[doc])
+        return keys
+
+    def save(self, filename: str) -> None:
+        """
+                Save the index to a file.
+
+                :param filename: Path of the file to write
+                """
+        import pickle
+
+        self._prepare()
+        with open(filename, "wb") as f:
+            pickle.dump(self, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+    @classmethod
+    def load(cls, filename: str) -> "TitleIndex":
+        """
+                Load an index saved with save(). The file is unpickled, so only load
+                files from a trusted source.
+
+                :param filename: Path of the file to read
+                :return: TitleIndex object
+                :raises ValueError: If the file does not contain a TitleIndex
+                """
+        import pickle
+
+        with open(filename, "rb") as f:
+            index = pickle.load(f)
+        if not isinstance(index, cls):
+            raise ValueError(f"{filename} does not contain a title index.")
+        return index
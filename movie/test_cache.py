@@ -0,0 +1,80 @@
+import io
+import unittest
+from contextlib import redirect_stdout
+
+from movie.cache import ReportCache, cached_report
+from movie.catalog import MovieCatalog
+from movie.fixtures import make_movie
+
+
+class ReportCacheTestCase(unittest.TestCase):
+    def test_lru_eviction(self):
+        cache = ReportCache(maxsize=2)
+        cache.put("a", "1")
+        cache.put("b", "2")
+        self.assertEqual(cache.get("a"), "1")  # "b" is now least recently used
+        cache.put("c", "3")
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("c"), "3")
+        self.assertEqual(cache.stats(), {"hits": 2, "misses": 1, "evictions": 1,
+                                         "size": 2, "maxsize": 2, "chars": 2})
+
+    def test_max_chars(self):
+        cache = ReportCache(maxsize=10, max_chars=5)
+        cache.put("a", "123")
+        cache.put("b", "45")
+        cache.put("c", "6")
+        self.assertIsNone(cache.get("a"))
+        cache.put("d", "too long")
+        self.assertIsNone(cache.get("d"))
+        with self.assertRaises(ValueError):
+            ReportCache(maxsize=0)
+
+    def test_cached_report(self):
+        cache = ReportCache()
+        calls = []
+
+        @cached_report(cache)
+        def print_count(movies, label):
+            calls.append(label)
+            print(f"{label}: {len(movies)}")
+
+        catalog = MovieCatalog([make_movie("m/1")])
+        for _ in range(3):
+            output = io.StringIO()
+            with redirect_stdout(output):
+                print_count(catalog, "films")
+            self.assertEqual(output.getvalue(), "films: 1\n")
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(cache.stats()["hits"], 2)
+
+        # a change of the catalog makes the cached result unreachable
+        catalog.add(make_movie("m/2"))
+        output = io.StringIO()
+        with redirect_stdout(output):
+            print_count(catalog, "films")
+        self.assertEqual(output.getvalue(), "films: 2\n")
+        self.assertEqual(len(calls), 2)
+
+        # a duplicate that is dropped does not change the catalog
+        version = catalog.version
+        catalog.add(make_movie("m/2"))
+        self.assertEqual(catalog.version, version)
+
+        # a movie changed in place is seen after touch()
+        catalog[0].title = "Changed"
+        catalog.touch(catalog[0])
+        with redirect_stdout(io.StringIO()):
+            print_count(catalog, "films")
+        self.assertEqual(len(calls), 3)
+        self.assertIsInstance(catalog.movies, tuple)
+
+        # plain lists are never cached
+        with redirect_stdout(io.StringIO()):
+            print_count([], "films")
+            print_count([], "films")
+        self.assertEqual(len(calls), 5)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,127 @@
+import csv
+import io
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+
+import eval02
+from movie.catalog import MovieCatalog
+from movie.fixtures import MOVIE_INFO, make_movie
+
+
+def write_csv(filename, rows):
+    with open(filename, "w", newline="", encoding="latin1") as f:
+        writer = csv.DictWriter(f, fieldnames=list(MOVIE_INFO))
+        writer.writeheader()
+        for row in rows:
+            writer.writerow({**MOVIE_INFO, **row})
+
+
+def exported_links(filename):
+    with open(filename, newline="", encoding="utf-8") as f:
+        return [row["rt_link"] for row in csv.DictReader(f)]
+
+
+class CatalogTestCase(unittest.TestCase):
+    def test_get_movie(self):
+        movies = [make_movie(f"m/{i}") for i in range(5)]
+        catalog = MovieCatalog(movies)
+        self.assertEqual(len(catalog), 5)
+        self.assertIs(catalog.get_movie("m/3"), movies[3])
+        self.assertIn("m/3", catalog)
+        with self.assertRaises(KeyError):
+            catalog.get_movie("m/unknown")
+
+    def test_get_movies(self):
+        movies = [make_movie(f"m/{i}") for i in range(5)]
+        catalog = MovieCatalog(movies)
+        found = catalog.get_movies(["m/4", "m/unknown", "m/0"])
+        self.assertEqual(found, [movies[4], movies[0]])
+
+    def test_select(self):
+        movies = [make_movie(f"m/{i}") for i in range(5)]
+        links = ["m/4", "m/unknown", "m/0", "m/4"]
+        self.assertEqual(MovieCatalog(movies).select(links), [movies[0], movies[4]])
+        # a catalog and a list give the same movies in the same order
+        self.assertEqual(eval02.select_movies(MovieCatalog(movies), links), [movies[0], movies[4]])
+        self.assertEqual(eval02.select_movies(movies, links), [movies[0], movies[4]])
+        self.assertEqual(eval02.select_movies(movies), movies)
+
+    def test_duplicate_policies(self):
+        first = make_movie("m/1", movie_title="First")
+        last = make_movie("m/1", movie_title="Last")
+
+        catalog = MovieCatalog([first, last], on_duplicate="first")
+        self.assertEqual(len(catalog), 1)
+        self.assertEqual(catalog.duplicates, 1)
+        self.assertIs(catalog.get_movie("m/1"), first)
+
+        catalog = MovieCatalog([first, make_movie("m/2"), last], on_duplicate="last")
+        self.assertEqual(len(catalog), 2)
+        self.assertIs(catalog.get_movie("m/1"), last)
+        self.assertIs(catalog[0], last)
+
+        with self.assertRaises(ValueError):
+            MovieCatalog([first, last], on_duplicate="error")
+        with self.assertRaises(ValueError):
+            MovieCatalog(on_duplicate="unknown")
+
+
+class LoadAndExportTestCase(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+        self.source = os.path.join(directory.name, "movies.csv")
+        write_csv(self.source, [
+            {"rotten_tomatoes_link": "m/a", "movie_title": "Zelig"},
+            {"rotten_tomatoes_link": "m/b", "movie_title": "Big", "audience_count": "10"},
+            {"rotten_tomatoes_link": "m/a", "movie_title": "Zelig again"},
+            {"rotten_tomatoes_link": "m/c", "movie_title": "Amélie", "audience_count": ""},
+            {"rotten_tomatoes_link": "m/d", "genre": "MUSICAL"},
+        ])
+
+    def load(self, **kwargs):
+        output = io.StringIO()
+        with redirect_stdout(output):
+            catalog = eval02.load_movies(self.source, **kwargs)
+        return catalog, output.getvalue()
+
+    def test_load_movies(self):
+        catalog, output = self.load()
+        self.assertEqual(catalog.links(), ["m/a", "m/b", "m/c"])
+        self.assertEqual(catalog.get_movie("m/a").title, "Zelig")
+        self.assertIn("1 movies were skipped", output)
+        self.assertIn("1 movies had a duplicate rt_link (policy: first).", output)
+
+        catalog, _ = self.load(on_duplicate="last")
+        self.assertEqual(catalog.get_movie("m/a").title, "Zelig again")
+        with self.assertRaises(ValueError):
+            self.load(on_duplicate="error")
+
+    def test_export_movies_by_links(self):
+        catalog, _ = self.load()
+        filename = os.path.join(self.directory, "export.csv")
+        with redirect_stdout(io.StringIO()):
+            eval02.export_movies(catalog, filename, links={"m/c", "m/a", "m/unknown"})
+        self.assertEqual(exported_links(filename), ["m/c", "m/a"])  # sorted by title
+
+        with redirect_stdout(io.StringIO()):
+            eval02.export_movies(list(catalog), filename, links=["m/b"])
+        self.assertEqual(exported_links(filename), ["m/b"])
+
+    def test_export_no_relevant_score_by_links(self):
+        catalog, _ = self.load()
+        filename = os.path.join(self.directory, "no_relevant_score.csv")
+        with redirect_stdout(io.StringIO()):
+            eval02.export_no_relevant_score(catalog, links=["m/a", "m/b"], filename=filename)
+        self.assertEqual(exported_links(filename), ["m/b"])  # m/a has a relevant score, m/c is not asked for
+
+        with redirect_stdout(io.StringIO()):
+            eval02.export_no_relevant_score(catalog, filename=filename)
+        self.assertEqual(exported_links(filename), ["m/c", "m/b"])
+
+
+if __name__ == '__main__':
+    unittest.main()
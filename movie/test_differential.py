@@ -0,0 +1,462 @@
+"""
+Differential tests: every optimized path (streaming load with dedup, batch
+predicates, indexes, cached reports, columnar export) must give the same result
+as a straightforward reference implementation with the original semantics.
+
+The input is a random CSV file per seed, including malformed rows, duplicate
+links, ties in score and length, and audience counts around the cutoff of 100.
+
+Run this module directly for a throughput comparison:
+    python -m movie.test_differential [rows]
+"""
+import csv
+import importlib.util
+import io
+import os
+import random
+import sys
+import tempfile
+import time
+import unittest
+from contextlib import redirect_stdout
+from datetime import date, datetime
+
+import eval02
+from movie import predicates, timeseries
+from movie.catalog import MovieCatalog
+from movie.movie import Movie, create_movie
+from movie.search import tokenize
+
+SEEDS = range(5)
+ROWS = 300
+NOW = datetime(2026, 1, 1)
+
+FIELDS = ["rotten_tomatoes_link", "movie_title", "content_rating", "genre", "directors",
+          "original_release_date", "streaming_release_date", "runtime", "production_company",
+          "audience_rating", "audience_count"]
+GENRES = ["ACTION & ADVENTURE", "COMEDY", "DRAMA", "HORROR", "ROMANCE",
+          "SCIENCE FICTION & FANTASY", "WESTERN"]
+RATINGS = ["NR", "G", "PG", "PG-13", "R", "NC17"]
+WORDS = ["the", "big", "sleep", "amélie", "night", "day", "dead", "love", "men", "12"]
+DIRECTORS = ["Alfred Hitchcock", "Chris Columbus", "Agnès Varda", "Joel Coen", "Ethan Coen",
+             "Sidney Lumet", "Nicole Holofcener"]
+COMPANIES = ["20th Century Fox", "HBO Video", "Lopert Pictures", ""]
+
+
+# =====================
+# Random input
+# =====================
+def random_date(rng: random.Random) -> str:
+    return date.fromordinal(rng.randint(date(1920, 1, 1).toordinal(), date(2025, 12, 31).toordinal())).isoformat()
+
+
+def random_row(rng: random.Random, number: int) -> dict:
+    row = {
+        "rotten_tomatoes_link": f"m/{number}",
+        "movie_title": " ".join(rng.choices(WORDS, k=rng.randint(1, 4))).title(),
+        "content_rating": rng.choice(RATINGS),
+        "genre": rng.choice(GENRES),
+        "directors": ", ".join(rng.sample(DIRECTORS, rng.randint(0, 2))),
+        "original_release_date": random_date(rng) if rng.random() < 0.9 else "",
+        "streaming_release_date": random_date(rng) if rng.random() < 0.9 else "",
+        "runtime": str(rng.choice([20, 29, 30, 70, 85, 100, 101, 180])) if rng.random() < 0.9 else "",
+        "production_company": rng.choice(COMPANIES),
+        "audience_rating": str(rng.choice([0, 39, 40, 80, 81, 97, 100])) if rng.random() < 0.9 else "",
+        "audience_count": str(rng.choice([0, 99, 100, 101, 25000])) if rng.random() < 0.9 else "",
+    }
+
+    # malformed rows that the loader has to skip
+    damage = rng.random()
+    if damage < 0.05:
+        row[rng.choice(["rotten_tomatoes_link", "movie_title", "content_rating", "genre"])] = ""
+    elif damage < 0.07:
+        row["genre"] = "MUSICAL"
+    elif damage < 0.09:
+        row["content_rating"] = "X"
+    elif damage < 0.11:
+        row[rng.choice(["runtime", "audience_rating", "audience_count"])] = "n/a"
+    elif damage < 0.13:
+        row[rng.choice(["original_release_date", "streaming_release_date"])] = "2010-13-45"
+    return row
+
+
+def write_random_csv(filename: str, seed: int, rows: int = ROWS) -> None:
+    """
+        Write a random movie CSV file. About 5% of the rows repeat an earlier link.
+
+        :param filename: Path of the CSV file to write
+        :param seed: Seed of the random generator, the same seed gives the same file
+        :param rows: Number of rows
+        """
+    rng = random.Random(seed)
+    with open(filename, "w", newline="", encoding="latin1") as f:
+        writer = csv.DictWriter(f, fieldnames=FIELDS)
+        writer.writeheader()
+        for number in range(rows):
+            row = random_row(rng, number)
+            if number and rng.random() < 0.05:
+                row["rotten_tomatoes_link"] = f"m/{rng.randrange(number)}"
+            writer.writerow(row)
+
+
+# =====================
+# Reference implementation
+# =====================
+def reference_load(filename: str) -> list[Movie]:
+    # the original load_movies: no dedup, no fuzzy director matching
+    movies = []
+    with open(filename, newline="", encoding="latin1") as csvfile:
+        for row in csv.DictReader(csvfile):
+            try:
+                movies.append(create_movie(row))
+            except Exception:
+                pass
+    return movies
+
+
+def reference_dedup(movies: list[Movie], keep_last: bool) -> list[Movie]:
+    positions = {}
+    result = []
+    for m in movies:
+        if m.rt_link not in positions:
+            positions[m.rt_link] = len(result)
+            result.append(m)
+        elif keep_last:
+            result[positions[m.rt_link]] = m
+    return result
+
+
+def reference_titles(movies: list[Movie], header: str, empty_message: str) -> None:
+    if not movies:
+        print(empty_message)
+        return
+    print(header)
+    for m in movies:
+        print(f"- {m.title}")
+
+
+def reference_number_of_films(movies):
+    print(f"Total number of films: {len(movies)}")
+
+
+def reference_films_per_genre(movies):
+    counts = {}
+    for m in movies:
+        counts[type(m).__name__] = counts.get(type(m).__name__, 0) + 1
+    order = ["ActionAdventure", "Comedy", "Drama", "Horror", "Romance", "ScienceFictionFantasy", "Western"]
+    for genre in sorted((g for g in order if g in counts), key=lambda g: counts[g], reverse=True):
+        print(f"{genre} : {counts[genre]}")
+
+
+def reference_highest_score(movies):
+    relevant = [m for m in movies if m.relevant_score()]
+    if not relevant:
+        print("No movies with relevant score.")
+        return
+    best = max(m.score for m in relevant)
+    print(f"Highest score: {best}")
+    for m in relevant:
+        if m.score == best:
+            print(f"- {m.title}")
+
+
+def reference_most_active_director(movies):
+    counts = {}
+    for m in movies:
+        for d in m.directors:
+            counts[d.fullname] = counts.get(d.fullname, 0) + 1
+    if not counts:
+        print("No directors found.")
+        return
+    best = max(counts.values())
+    print(f"Most active director(s) ({best} films):")
+    for name, count in counts.items():
+        if count == best:
+            print("-", name)
+
+
+def reference_shortest_and_longest(movies):
+    with_length = [m for m in movies if m.length is not None]
+    if not with_length:
+        print("No movies with length information.")
+        return
+    shortest = min(m.length for m in with_length)
+    longest = max(m.length for m in with_length)
+    reference_titles([m for m in with_length if m.length == shortest], f"Shortest movie(s) ({shortest} min):", "")
+    reference_titles([m for m in with_length if m.length == longest], f"Longest movie(s) ({longest} min):", "")
+
+
+def reference_score_list(movies):
+    for score in range(101):
+        print(f"{score}%: {sum(1 for m in movies if m.score == score)}")
+
+
+def reference_uneven_month_releases(movies):
+    reference_titles([m for m in movies if m.release_date is not None and m.release_date.month % 2 == 1],
+                     "Movies released in an uneven month:", "No movies released in an uneven month.")
+
+
+def reference_scary_horror(movies):
+    reference_titles([m for m in movies if type(m).__name__ == "Horror" and m.is_scary()],
+                     "Scary horror movies:", "No scary horror movies found.")
+
+
+def reference_cosy_romances(movies):
+    reference_titles([m for m in movies if hasattr(m, "is_cosy") and m.is_cosy()],
+                     "Cosy romance movies:", "No cosy romance movies found.")
+
+
+def reference_slapstick_comedies(movies):
+    reference_titles([m for m in movies if hasattr(m, "is_slapstick") and m.is_slapstick()],
+                     "Slapstick comedies:", "No slapstick comedies found.")
+
+
+def reference_search(movies: list[Movie], query: str, include_others: bool) -> list[Movie]:
+    # every query word must match, the last one may be the start of a word
+    tokens = tokenize(query)
+    normalized = " ".join(tokens)
+    *words, last = tokens
+
+    def title(m):
+        return " ".join(tokenize(m.title))
+
+    def others(m):
+        return [token for name in [d.fullname for d in m.directors] + [m.company or ""] for token in tokenize(name)]
+
+    def matches(found):
+        return all(word in found for word in words) and any(token.startswith(last) for token in found)
+
+    result = sorted((m for m in movies if title(m).startswith(normalized)), key=title)
+    result += [m for m in movies if m not in result and matches(tokenize(m.title))]
+    if include_others:
+        result += [m for m in movies if m not in result and matches(tokenize(m.title) + others(m))]
+    return result
+
+
+def reference_row(m: Movie) -> dict:
+    # one movie as the Arrow export should store it
+    return {
+        "rt_link": m.rt_link,
+        "title": m.title,
+        "rating": m.rating.code,
+        "genre": type(m).__name__,
+        "directors": [d.fullname for d in m.directors],
+        "release_date": None if m.release_date is None else m.release_date.date(),
+        "streaming_date": None if m.streaming_date is None else m.streaming_date.date(),
+        "length": m.length,
+        "company": m.company,
+        "score": m.score,
+        "count": m.count,
+    }
+
+
+REPORTS = (
+    (eval02.print_number_of_films, reference_number_of_films),
+    (eval02.print_films_per_genre, reference_films_per_genre),
+    (eval02.print_highest_score, reference_highest_score),
+    (eval02.print_most_active_director, reference_most_active_director),
+    (eval02.print_shortest_and_longest, reference_shortest_and_longest),
+    (eval02.print_score_list, reference_score_list),
+    (eval02.print_uneven_month_releases, reference_uneven_month_releases),
+    (eval02.print_scary_horror, reference_scary_horror),
+    (eval02.print_cosy_romances, reference_cosy_romances),
+    (eval02.print_slapstick_comedies, reference_slapstick_comedies),
+)
+
+
+def output(report, *args, **kwargs) -> str:
+    """
+        :return: The text printed by report(*args, **kwargs).
+        """
+    buffer = io.StringIO()
+    with redirect_stdout(buffer):
+        report(*args, **kwargs)
+    return buffer.getvalue()
+
+
+def load_quietly(filename: str, **kwargs) -> MovieCatalog:
+    # load_movies prints how many rows were skipped
+    with redirect_stdout(io.StringIO()):
+        return eval02.load_movies(filename, director_threshold=None, **kwargs)
+
+
+# =====================
+# Tests
+# =====================
+class DifferentialTestCase(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def for_each_seed(self):
+        for seed in SEEDS:
+            filename = os.path.join(self.directory.name, f"movies_{seed}.csv")
+            write_random_csv(filename, seed)
+            with self.subTest(seed=seed):
+                yield filename, reference_load(filename)
+
+    def assertSameMovies(self, movies, expected):
+        self.assertEqual([vars(m) for m in movies], [vars(m) for m in expected])
+        self.assertEqual([type(m) for m in movies], [type(m) for m in expected])
+
+    def test_load(self):
+        for filename, reference in self.for_each_seed():
+            self.assertSameMovies(load_quietly(filename, on_duplicate="first"),
+                                  reference_dedup(reference, keep_last=False))
+            self.assertSameMovies(load_quietly(filename, on_duplicate="last"),
+                                  reference_dedup(reference, keep_last=True))
+
+    def test_reports(self):
+        for filename, reference in self.for_each_seed():
+            catalog = load_quietly(filename)
+            movies = reference_dedup(reference, keep_last=False)
+            for report, reference_report in REPORTS:
+                expected = output(reference_report, movies)
+                self.assertEqual(output(report, list(catalog)), expected, report.__name__)
+                # first call fills the cache, second call is served from it
+                self.assertEqual(output(report, catalog), expected, report.__name__)
+                self.assertEqual(output(report, catalog), expected, report.__name__)
+
+    def test_predicates(self):
+        for _, reference in self.for_each_seed():
+            masks = predicates.evaluate(reference, now=NOW)
+            self.assertEqual(masks["classic"], [m.is_classic(NOW) for m in reference])
+            self.assertEqual(masks["short"], [m.is_short() for m in reference])
+            for name, method in (("cosy", "is_cosy"), ("slapstick", "is_slapstick"), ("scary", "is_scary")):
+                self.assertEqual(masks[name], [hasattr(m, method) and getattr(m, method)() for m in reference])
+
+    def test_date_index(self):
+        for _, reference in self.for_each_seed():
+            index = timeseries.DateIndex(reference, "release_date")
+            start, end = date(1950, 1, 1), date(1990, 6, 15)
+            expected = sorted((m for m in reference
+                               if m.release_date is not None and start <= m.release_date.date() < end),
+                              key=lambda m: m.release_date)
+            self.assertEqual(index.between(start, end), expected)
+
+            counts = {}
+            for m in reference:
+                if m.release_date is not None:
+                    key = f"{m.release_date.year}-{m.release_date.month:02d}"
+                    counts[key] = counts.get(key, 0) + 1
+            buckets = index.buckets("month")
+            self.assertEqual({key: bucket["count"] for key, bucket in buckets.items()}, counts)
+            self.assertEqual(list(buckets), sorted(counts))
+
+    def test_search(self):
+        for filename, _ in self.for_each_seed():
+            catalog = load_quietly(filename)
+            movies = list(catalog)
+            for query in ("the big", "amelie", "dead men", "12", "nig", "the da", "coen", "hbo vid"):
+                for include_others in (False, True):
+                    self.assertEqual(catalog.search(query, limit=len(catalog), include_others=include_others),
+                                     reference_search(movies, query, include_others), (query, include_others))
+                self.assertEqual(catalog.search(query, limit=3), reference_search(movies, query, True)[:3], query)
+
+                prefix = " ".join(tokenize(query))
+                expected = sorted((m for m in catalog if " ".join(tokenize(m.title)).startswith(prefix)),
+                                  key=lambda m: (" ".join(tokenize(m.title)), catalog.links().index(m.rt_link)))
+                self.assertEqual(catalog.autocomplete(query, limit=len(catalog)), expected, query)
+
+    @unittest.skipUnless(importlib.util.find_spec("numpy"), "numpy is not installed")
+    def test_columnar(self):
+        from movie import export
+
+        for filename, _ in self.for_each_seed():
+            catalog = load_quietly(filename)
+            for encode_strings in (False, True):
+                arrays = export.to_numpy(catalog, batch_size=37, encode_strings=encode_strings)
+                table, directors, offsets = arrays["movies"], arrays["directors"], arrays["director_offsets"]
+                for i, m in enumerate(catalog):
+                    row = {field: table[i][field].item() for field in table.dtype.names}
+                    for field in export.ENCODED_FIELDS if encode_strings else ():
+                        row[field] = str(arrays[f"{field}_values"][row[field]])
+                    row["directors"] = [str(name) for name in directors[offsets[i]:offsets[i + 1]]]
+                    # NumPy has no None: missing numbers are MISSING, a missing company is ""
+                    expected = reference_row(m)
+                    for field in ("length", "score", "count"):
+                        if expected[field] is None:
+                            expected[field] = export.MISSING
+                    expected["company"] = expected["company"] or ""
+                    self.assertEqual(row, expected, m.rt_link)
+
+    @unittest.skipUnless(importlib.util.find_spec("pyarrow"), "pyarrow is not installed")
+    def test_arrow(self):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        from movie import export
+
+        for filename, _ in self.for_each_seed():
+            catalog = load_quietly(filename)
+            expected = [reference_row(m) for m in catalog]
+            for encode_strings in (False, True):
+                parquet = os.path.join(self.directory.name, "movies.parquet")
+                export.export_parquet(catalog, parquet, batch_size=37, encode_strings=encode_strings)
+                self.assertEqual(pq.read_table(parquet).to_pylist(), expected)
+
+                arrow = os.path.join(self.directory.name, "movies.arrow")
+                export.export_arrow(iter(catalog), arrow, batch_size=37, encode_strings=encode_strings)
+                with pa.memory_map(arrow) as source:
+                    self.assertEqual(pa.ipc.open_file(source).read_all().to_pylist(), expected)
+
+
+# =====================
+# Throughput comparison
+# =====================
+def timed(function, *args) -> float:
+    start = time.perf_counter()
+    function(*args)
+    return time.perf_counter() - start
+
+
+def throughput_report(rows: int = 100_000, seed: int = 0) -> list[tuple[str, float, float]]:
+    """
+        Time the reference and the optimized path of every engine on one random file.
+        Reports are timed twice: on an empty report cache and served from the cache.
+
+        :param rows: Number of rows of the random CSV file
+        :param seed: Seed of the random CSV file
+        :return: List of tuples (name, reference seconds, optimized seconds)
+        """
+    with tempfile.TemporaryDirectory() as directory:
+        filename = os.path.join(directory, "movies.csv")
+        write_random_csv(filename, seed, rows)
+
+        start = time.perf_counter()
+        reference = reference_dedup(reference_load(filename), keep_last=False)
+        reference_seconds = time.perf_counter() - start
+        start = time.perf_counter()
+        catalog = load_quietly(filename)
+        results = [("load", reference_seconds, time.perf_counter() - start)]
+
+    for report, reference_report in REPORTS:
+        reference_seconds = timed(output, reference_report, reference)
+        eval02.REPORT_CACHE.clear()
+        results.append((f"{report.__name__} (uncached)", reference_seconds, timed(output, report, catalog)))
+        results.append((f"{report.__name__} (cached)", reference_seconds, timed(output, report, catalog)))
+
+    results.append(("predicates",
+                    timed(lambda: [(m.is_classic(NOW), m.is_short()) for m in reference]),
+                    timed(predicates.evaluate, catalog, ("classic", "short"), NOW)))
+
+    start_date, end_date = date(1980, 1, 1), date(1981, 1, 1)
+    catalog.date_index()  # built once, used by every query
+    results.append(("date range",
+                    timed(lambda: [m for m in reference if m.release_date is not None
+                                   and start_date <= m.release_date.date() < end_date]),
+                    timed(catalog.date_index().between, start_date, end_date)))
+
+    catalog.search("x")  # the index and its sorted titles are built once, used by every query
+    results.append(("title search",
+                    timed(lambda: [m for m in reference if "sleep" in tokenize(m.title)]),
+                    timed(catalog.search, "sleep")))
+    return results
+
+
+if __name__ == "__main__":
+    row_count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    print(f"{'Engine':<45}{'Reference':>12}{'Optimized':>12}{'Speed-up':>10}")
+    for name, reference_time, optimized_time in throughput_report(row_count):
+        speedup = reference_time / optimized_time if optimized_time else float("inf")
+        print(f"{name:<45}{reference_time * 1000:>10.1f}ms{optimized_time * 1000:>10.1f}ms{speedup:>9.1f}x")
@@ -0,0 +1,41 @@
+import unittest
+
+from movie.encoding import StringTable, decode_column, encode_column
+from movie.fixtures import MOVIE_INFO, make_movie
+from movie.movie import create_movie
+
+
+class EncodingTestCase(unittest.TestCase):
+    def test_string_table(self):
+        table = StringTable(["HBO Video", "20th Century Fox"])
+        self.assertEqual(table.encode("HBO Video"), 0)
+        self.assertEqual(table.encode("Lopert Pictures"), 2)
+        self.assertEqual(table.decode(1), "20th Century Fox")
+        self.assertEqual(len(table), 3)
+        copy = "".join(["HBO", " Video"])
+        self.assertIs(table.intern(copy), table.decode(0))
+        self.assertIsNone(table.intern(None))
+
+    def test_encode_column(self):
+        values = ["HBO Video", None, "HBO Video", "Lopert Pictures"]
+        codes, table = encode_column(values)
+        self.assertEqual(list(codes), [1, 0, 1, 2])
+        self.assertEqual(codes.typecode, "H")
+        self.assertEqual(decode_column(codes, table), values)
+
+    def test_company_is_shared(self):
+        first, second = make_movie("m/1"), make_movie("m/2")
+        self.assertIs(first.company, second.company)
+
+    def test_shared_table_across_batches(self):
+        table = StringTable()
+        first, _ = encode_column(["PG", "R"], table)
+        second, _ = encode_column(["R", "G"], table)
+        self.assertEqual(list(first) + list(second), [1, 2, 2, 3])
+
+    def test_company_without_table(self):
+        info = {**MOVIE_INFO, "production_company": "".join(["HBO", " Video"])}
+        self.assertIs(create_movie(info, companies=None).company, info["production_company"])
+
+if __name__ == '__main__':
+    unittest.main()
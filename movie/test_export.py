@@ -0,0 +1,106 @@
+import importlib.util
+import os
+import tempfile
+import unittest
+from datetime import date
+
+from movie import export
+from movie.fixtures import make_movie
+
+HAS_NUMPY = importlib.util.find_spec("numpy") is not None
+HAS_PYARROW = importlib.util.find_spec("pyarrow") is not None
+
+
+def make_movies():
+    return [
+        make_movie(),
+        make_movie("m/empty", directors="Ethan Coen, Joel Coen", runtime="", original_release_date="",
+                   audience_rating="", audience_count="", production_company=""),
+        make_movie("m/none", directors=""),
+    ]
+
+
+@unittest.skipUnless(HAS_NUMPY, "numpy is not installed")
+class NumpyExportTestCase(unittest.TestCase):
+    def test_to_numpy(self):
+        import numpy as np
+
+        arrays = export.to_numpy(make_movies(), batch_size=2)
+        table = arrays["movies"]
+        self.assertEqual(list(table["rt_link"]), ["m/1000640-all_of_me", "m/empty", "m/none"])
+        self.assertEqual(table["release_date"][0], np.datetime64("1984-09-21"))
+        self.assertTrue(np.isnat(table["release_date"][1]))
+        self.assertEqual(list(table["length"]), [93, export.MISSING, 93])
+        self.assertEqual(list(table["genre"]), ["Comedy"] * 3)
+
+        directors, offsets = arrays["directors"], arrays["director_offsets"]
+        self.assertEqual(list(offsets), [0, 1, 3, 3])
+        self.assertEqual(list(directors[offsets[1]:offsets[2]]), ["Ethan Coen", "Joel Coen"])
+
+    def test_export_npz(self):
+        import numpy as np
+
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, "movies.npz")
+            export.export_npz(make_movies(), filename)
+            with np.load(filename) as data:
+                self.assertEqual(len(data["movies"]), 3)
+                self.assertEqual(data["movies"]["score"][0], 67)
+
+    def test_encode_strings(self):
+        plain = export.to_numpy(make_movies())["movies"]
+        arrays = export.to_numpy(make_movies(), batch_size=2, encode_strings=True)
+        table = arrays["movies"]
+        self.assertEqual(table["company"].dtype.name, "uint16")
+        for field in export.ENCODED_FIELDS:
+            self.assertEqual(list(arrays[f"{field}_values"][table[field]]), list(plain[field]))
+
+    def test_batch_size(self):
+        with self.assertRaises(ValueError):
+            export.to_numpy(make_movies(), batch_size=0)
+
+
+@unittest.skipUnless(HAS_PYARROW, "pyarrow is not installed")
+class ArrowExportTestCase(unittest.TestCase):
+    def test_export_parquet(self):
+        import pyarrow.parquet as pq
+
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, "movies.parquet")
+            export.export_parquet(iter(make_movies()), filename, batch_size=2)
+            rows = pq.read_table(filename).to_pylist()
+
+        self.assertEqual(len(rows), 3)
+        self.assertEqual(rows[0]["release_date"], date(1984, 9, 21))
+        self.assertEqual(rows[1]["directors"], ["Ethan Coen", "Joel Coen"])
+        self.assertIsNone(rows[1]["release_date"])
+        self.assertIsNone(rows[1]["score"])
+        self.assertEqual(rows[2]["directors"], [])
+
+    def test_encode_strings(self):
+        import pyarrow as pa
+
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, "movies.arrow")
+            export.export_arrow(make_movies(), filename, batch_size=2, encode_strings=True)
+            with pa.memory_map(filename) as source:
+                table = pa.ipc.open_file(source).read_all()
+        self.assertEqual(table.schema, export.arrow_schema(encode_strings=True))
+        rows = table.to_pylist()
+        self.assertEqual([row["company"] for row in rows], ["HBO Video", "", "HBO Video"])
+        self.assertEqual(rows, pa.Table.from_batches(export.to_arrow_batches(make_movies())).to_pylist())
+
+    def test_export_arrow(self):
+        import pyarrow as pa
+
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, "movies.arrow")
+            export.export_arrow(make_movies(), filename)
+            with pa.memory_map(filename) as source:
+                table = pa.ipc.open_file(source).read_all()
+        self.assertEqual(table.schema, export.arrow_schema())
+        self.assertEqual(table.num_rows, 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,47 @@
+import os
+import subprocess
+import sys
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Budget in microseconds for the cumulative import time of movie.movie, as reported by
+# -X importtime. Locally it is a few milliseconds; the margin is for slow CI machines.
+IMPORT_BUDGET_US = 50_000
+
+# Modules that are only needed by optional paths and must not be loaded at startup
+LAZY_MODULES = ("numpy", "pyarrow", "statistics", "tracemalloc", "pickle", "difflib", "movie.export")
+
+
+def import_times(module: str) -> dict[str, int]:
+    """
+        Import a module in a new interpreter with -X importtime.
+
+        :param module: Name of the module to import
+        :return: Dictionary mapping every imported module to its cumulative import time in µs
+        """
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                            cwd=ROOT, capture_output=True, text=True, check=True)
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+class ImportTimeTestCase(unittest.TestCase):
+    def test_movie_import_budget(self):
+        # best of three, so one slow run does not fail the test
+        best = min(import_times("movie.movie")["movie.movie"] for _ in range(3))
+        self.assertLess(best, IMPORT_BUDGET_US, f"import movie.movie took {best} µs")
+
+    def test_optional_modules_are_lazy(self):
+        imported = import_times("eval02")
+        for module in LAZY_MODULES:
+            self.assertNotIn(module, imported, f"{module} is imported at startup")
+
+
+if __name__ == '__main__':
+    unittest.main()
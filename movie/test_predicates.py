@@ -0,0 +1,47 @@
+import unittest
+from datetime import datetime
+
+from movie import predicates
+from movie.fixtures import make_movie
+
+GENRES = ("ACTION & ADVENTURE", "COMEDY", "DRAMA", "HORROR", "ROMANCE",
+          "SCIENCE FICTION & FANTASY", "WESTERN")
+
+
+def make_movies():
+    movies = []
+    for genre in GENRES:
+        for rating in ("NR", "PG", "R"):
+            for score, count in (("85", "500"), ("30", "500"), ("30", "50"), ("", "")):
+                for runtime in ("20", "90", ""):
+                    for release in ("1950-01-01", "2024-01-01", ""):
+                        movies.append(make_movie(genre=genre, content_rating=rating,
+                                                 audience_rating=score, audience_count=count,
+                                                 runtime=runtime, original_release_date=release))
+    return movies
+
+
+class PredicatesTestCase(unittest.TestCase):
+    def test_matches_methods(self):
+        movies = make_movies()
+        now = datetime(2026, 1, 1)
+        masks = predicates.evaluate(movies, now=now)
+
+        self.assertEqual(masks["classic"], [m.is_classic(now) for m in movies])
+        self.assertEqual(masks["short"], [m.is_short() for m in movies])
+        for name, method in (("cosy", "is_cosy"), ("slapstick", "is_slapstick"), ("scary", "is_scary")):
+            expected = [hasattr(m, method) and getattr(m, method)() for m in movies]
+            self.assertEqual(masks[name], expected, name)
+
+    def test_indices_and_select(self):
+        movies = make_movies()
+        positions = predicates.indices(predicates.mask(movies, "scary"))
+        self.assertEqual([movies[i] for i in positions], predicates.select(movies, "scary"))
+
+    def test_unknown_predicate(self):
+        with self.assertRaises(ValueError):
+            predicates.evaluate([], ["unknown"])
+
+
+if __name__ == '__main__':
+    unittest.main()
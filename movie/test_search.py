@@ -0,0 +1,90 @@
+import os
+import tempfile
+import unittest
+
+from movie.catalog import KEEP_LAST, MovieCatalog
+from movie.fixtures import make_catalog, make_movie
+from movie.search import TitleIndex, fold
+
+TITLES = ["Amélie", "The Big Sleep", "The Big Heat", "Big", "Sleepless in Seattle"]
+
+
+def title_catalog():
+    return make_catalog(dict(rt_link=f"m/{i}", movie_title=title) for i, title in enumerate(TITLES))
+
+
+class SearchTestCase(unittest.TestCase):
+    def test_fold(self):
+        self.assertEqual(fold("AMÉLIE"), "amelie")
+
+    def test_search_ranking(self):
+        catalog = title_catalog()
+        self.assertEqual(catalog.search("amelie")[0].title, "Amélie")
+        self.assertEqual(catalog.search("big")[0].title, "Big")
+        self.assertEqual(catalog.search("the big sl")[0].title, "The Big Sleep")
+        self.assertEqual({m.title for m in catalog.search("sleep")}, {"The Big Sleep", "Sleepless in Seattle"})
+        self.assertEqual(catalog.search(""), [])
+
+    def test_search_other_fields(self):
+        catalog = title_catalog()
+        self.assertEqual(len(catalog.search("reiner")), len(TITLES))
+        self.assertEqual(catalog.search("reiner", include_others=False), [])
+
+    def test_autocomplete(self):
+        catalog = title_catalog()
+        titles = [m.title for m in catalog.autocomplete("the big")]
+        self.assertEqual(titles, ["The Big Heat", "The Big Sleep"])
+
+    def test_index_follows_catalog(self):
+        catalog = title_catalog()
+        self.assertEqual(catalog.search("heat")[0].title, "The Big Heat")
+        catalog.add(make_movie("m/new", movie_title="Heat"))
+        self.assertEqual(catalog.search("heat")[0].title, "Heat")
+        self.assertEqual(catalog.autocomplete("hea")[0].title, "Heat")
+
+    def test_index_follows_replacement(self):
+        catalog = MovieCatalog(title_catalog(), on_duplicate=KEEP_LAST)
+        self.assertEqual(catalog.search("amelie")[0].title, "Amélie")
+        catalog.add(make_movie("m/0", movie_title="Zelig"))
+        self.assertEqual(catalog.search("amelie"), [])
+        self.assertEqual([m.title for m in catalog.search("zel")], ["Zelig"])
+
+    def test_index_follows_touch(self):
+        catalog = title_catalog()
+        self.assertEqual(catalog.search("zelig"), [])
+        catalog[0].title = "Zelig"
+        catalog.touch(catalog[0])
+        self.assertEqual([m.title for m in catalog.search("zelig")], ["Zelig"])
+        with self.assertRaises(KeyError):
+            catalog.touch(make_movie("m/unknown"))
+
+    def test_all_words_must_match(self):
+        catalog = title_catalog()
+        self.assertEqual([m.title for m in catalog.search("big seattle")], [])
+        self.assertEqual([m.title for m in catalog.search("sleep big")], ["The Big Sleep"])
+        self.assertEqual(len(catalog.search("the", limit=1)), 1)
+
+    def test_save_and_load(self):
+        catalog = title_catalog()
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, "index.pickle")
+            catalog.save_search_index(filename)
+            self.assertIsInstance(TitleIndex.load(filename), TitleIndex)
+
+            other = title_catalog()
+            other.load_search_index(filename)
+            self.assertEqual(other.search("amelie")[0].title, "Amélie")
+
+            other.add(make_movie("m/new", movie_title="Heat"))
+            with self.assertRaises(ValueError):
+                other.load_search_index(filename)
+
+            # same links, but a title changed after the index was saved
+            changed = title_catalog()
+            changed[1].title = "The Long Goodbye"
+            with self.assertRaises(ValueError):
+                changed.load_search_index(filename)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,64 @@
+import unittest
+from datetime import date
+
+from movie.fixtures import make_catalog, make_movie
+from movie.timeseries import DateIndex, lag_distribution, streaming_lags
+
+RELEASES = (
+    # rt_link, release date, streaming date, score, count
+    ("m/1", "2010-02-12", "2010-03-14", "50", "100"),
+    ("m/2", "2010-01-01", "2010-01-11", "70", "200"),
+    ("m/3", "2010-05-30", "", "", "300"),
+    ("m/4", "2011-12-31", "2011-12-31", "90", ""),
+    ("m/5", "", "2012-01-01", "10", "10"),
+)
+
+
+def release_catalog():
+    return make_catalog(
+        dict(rt_link=rt_link, original_release_date=release, streaming_release_date=streaming,
+             audience_rating=score, audience_count=count)
+        for rt_link, release, streaming, score, count in RELEASES
+    )
+
+
+class DateIndexTestCase(unittest.TestCase):
+    def test_between(self):
+        index = release_catalog().date_index("release_date")
+        self.assertEqual(len(index), 4)
+        self.assertEqual([m.rt_link for m in index.between()], ["m/2", "m/1", "m/3", "m/4"])
+        self.assertEqual([m.rt_link for m in index.between(date(2010, 2, 1), date(2010, 5, 30))], ["m/1"])
+        self.assertEqual(index.count_between(end=date(2011, 1, 1)), 3)
+        self.assertEqual(index.count_between(date(2012, 1, 1), date(2011, 1, 1)), 0)
+
+    def test_buckets(self):
+        index = release_catalog().date_index("release_date")
+        self.assertEqual(index.buckets("year"), {
+            "2010": {"count": 3, "mean_score": 60.0, "audience_count": 600},
+            "2011": {"count": 1, "mean_score": 90.0, "audience_count": 0},
+        })
+        self.assertEqual(list(index.buckets("quarter")), ["2010-Q1", "2010-Q2", "2011-Q4"])
+        self.assertEqual(index.buckets("month")["2010-05"]["mean_score"], None)
+        with self.assertRaises(ValueError):
+            index.buckets("week")
+        with self.assertRaises(ValueError):
+            DateIndex([], "runtime")
+
+    def test_lags(self):
+        lags = streaming_lags(release_catalog())
+        self.assertEqual(lags, [30, 10, 0])
+        distribution = lag_distribution(lags)
+        self.assertEqual(distribution["count"], 3)
+        self.assertEqual(distribution["median"], 10)
+        self.assertEqual(distribution["max"], 30)
+        self.assertIsNone(lag_distribution([])["median"])
+
+    def test_index_follows_catalog(self):
+        catalog = release_catalog()
+        self.assertEqual(len(catalog.date_index("streaming_date")), 4)
+        catalog.add(make_movie("m/6"))
+        self.assertEqual(len(catalog.date_index("streaming_date")), 5)
+
+
+if __name__ == '__main__':
+    unittest.main()
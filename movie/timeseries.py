@@ -0,0 +1,168 @@
+from bisect import bisect_left
+from datetime import date
+from typing import Iterable
+
+from movie.movie import Movie
+
+DATE_FIELDS = ("release_date", "streaming_date")
+PERIODS = ("year", "quarter", "month")
+
+
+def _period_key(ordinal: int, period: str) -> str:
+    day = date.fromordinal(ordinal)
+    if period == "year":
+        return f"{day.year}"
+    if period == "quarter":
+        return f"{day.year}-Q{(day.month - 1) // 3 + 1}"
+    return f"{day.year}-{day.month:02d}"
+
+
+def _to_ordinal(day: date) -> int:
+    return day.toordinal()
+
+
+class DateIndex:
+    """
+        Movies sorted on one of their date fields, stored as integer day numbers
+        (date.toordinal()) so date ranges can be found with a binary search.
+        Movies without a date for the field are not in the index.
+
+        :field: The date field of the index ("release_date" or "streaming_date").
+        :ordinals: Sorted day numbers.
+        :movies: The movies in the same order as ordinals.
+        """
+
+    def __init__(self, movies: Iterable[Movie], field: str = "release_date") -> None:
+        """
+                :param movies: MovieCatalog or list of Movie objects
+                :param field: The date field to index
+                :raises ValueError: If the field is not a date field
+                """
+        if field not in DATE_FIELDS:
+            raise ValueError(f"Unknown date field: {field}")
+
+        pairs = [(_to_ordinal(getattr(m, field)), i, m)
+                 for i, m in enumerate(movies) if getattr(m, field) is not None]
+        pairs.sort(key=lambda pair: pair[:2])  # stable on load order for equal dates
+
+        self.field = field
+        self.ordinals = [ordinal for ordinal, _, _ in pairs]
+        self.movies = [m for _, _, m in pairs]
+
+    def __len__(self) -> int:
+        return len(self.ordinals)
+
+    def _bounds(self, start: date = None, end: date = None) -> tuple[int, int]:
+        low = 0 if start is None else bisect_left(self.ordinals, _to_ordinal(start))
+        high = len(self.ordinals) if end is None else bisect_left(self.ordinals, _to_ordinal(end))
+        return low, max(low, high)
+
+    def between(self, start: date = None, end: date = None) -> list[Movie]:
+        """
+                Find the movies with a date in [start, end).
+
+                :param start: First date to include, or None for no lower bound
+                :param end: First date to exclude, or None for no upper bound
+                :return: List of Movie objects sorted on the date
+                """
+        low, high = self._bounds(start, end)
+        return self.movies[low:high]
+
+    def count_between(self, start: date = None, end: date = None) -> int:
+        """
+                :return: The number of movies with a date in [start, end).
+                """
+        low, high = self._bounds(start, end)
+        return high - low
+
+    def buckets(self, period: str = "year", start: date = None, end: date = None) -> dict[str, dict]:
+        """
+                Group the movies per year, quarter or month and compute for each group
+                the number of movies, the mean score and the total audience count.
+
+                :param period: "year", "quarter" or "month"
+                :param start: First date to include, or None for no lower bound
+                :param end: First date to exclude, or None for no upper bound
+                :return: Dictionary mapping the period (e.g. '2010', '2010-Q1', '2010-01')
+                         to a dictionary with "count", "mean_score" (None if no movie has a
+                         score) and "audience_count", in chronological order
+                :raises ValueError: If the period is unknown
+                """
+        if period not in PERIODS:
+            raise ValueError(f"Unknown period: {period}")
+
+        low, high = self._bounds(start, end)
+        result = {}
+        key = None
+        last_ordinal = None
+        for position in range(low, high):
+            ordinal = self.ordinals[position]
+            if ordinal != last_ordinal:  # sorted, so the key only changes with the day
+                key = _period_key(ordinal, period)
+                last_ordinal = ordinal
+                if key not in result:
+                    result[key] = {"count": 0, "score_total": 0, "scored": 0, "audience_count": 0}
+            bucket = result[key]
+            m = self.movies[position]
+            bucket["count"] += 1
+            if m.score is not None:
+                bucket["score_total"] += m.score
+                bucket["scored"] += 1
+            if m.count is not None:
+                bucket["audience_count"] += m.count
+
+        return {
+            key: {
+                "count": bucket["count"],
+                "mean_score": bucket["score_total"] / bucket["scored"] if bucket["scored"] else None,
+                "audience_count": bucket["audience_count"],
+            }
+            for key, bucket in result.items()
+        }
+
+
+def streaming_lags(movies: Iterable[Movie]) -> list[int]:
+    """
+        Compute the number of days between release and streaming release for every
+        movie that has both dates.
+
+        :param movies: MovieCatalog or list of Movie objects
+        :return: List of lags in days (negative when streaming came first)
+        """
+    return [
+        _to_ordinal(m.streaming_date) - _to_ordinal(m.release_date)
+        for m in movies
+        if m.release_date is not None and m.streaming_date is not None
+    ]
+
+
+def lag_distribution(lags: list[int]) -> dict:
+    """
+        Summarize a list of lags.
+
+        :param lags: Lags in days, see streaming_lags()
+        :return: Dictionary with "count", "min", "p25", "median", "p75", "p90", "max" and
+                 "mean"; all values except "count" are None when there are no lags
+        """
+    if not lags:
+        return {"count": 0, "min": None, "p25": None, "median": None, "p75": None,
+                "p90": None, "max": None, "mean": None}
+
+    import statistics  # slow to import (fractions, decimal, random)
+
+    ordered = sorted(lags)
+    if len(ordered) > 1:
+        cuts = statistics.quantiles(ordered, n=20, method="inclusive")  # every 5%
+        p25, p75, p90 = cuts[4], cuts[14], cuts[17]
+    else:
+        p25 = p75 = p90 = ordered[0]
+    return {
+        "count": len(ordered),
+        "min": ordered[0],
+        "p25": p25,
+        "median": statistics.median(ordered),
+        "p75": p75,
+        "p90": p90,
+        "max": ordered[-1],
+        "mean": statistics.fmean(ordered),
+    }
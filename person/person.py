@@ -1,12 +1,199 @@
+import functools
+import unicodedata
+from math import ceil, floor
+
+# Default similarity (0..1) above which two names in the same block are the same person
+DEFAULT_THRESHOLD = 0.9
+
+# Given names that are known short forms of longer ones. A short form and one of
+# its long forms count as the same name; two long forms of one short form do not.
+SHORT_FORMS = {
+    "alex": ("alexander", "alexandra", "alexis"),
+    "andy": ("andrew",),
+    "ben": ("benjamin",),
+    "bill": ("william",),
+    "bob": ("robert",),
+    "chris": ("christopher", "christian", "christine", "christina"),
+    "dan": ("daniel",),
+    "dave": ("david",),
+    "ed": ("edward", "edwin", "edgar"),
+    "fred": ("frederick", "frederic"),
+    "greg": ("gregory",),
+    "jim": ("james",),
+    "joe": ("joseph",),
+    "jon": ("jonathan",),
+    "kate": ("katherine", "catherine", "kathryn"),
+    "ken": ("kenneth",),
+    "liz": ("elizabeth",),
+    "matt": ("matthew",),
+    "mike": ("michael",),
+    "nick": ("nicholas", "nicolas"),
+    "pete": ("peter",),
+    "rob": ("robert",),
+    "sam": ("samuel", "samantha"),
+    "steve": ("steven", "stephen"),
+    "tom": ("thomas",),
+    "tony": ("anthony",),
+    "will": ("william",),
+}
+
+# An abbreviation with a trailing dot ('Chris.') needs at least this many letters
+MIN_ABBREVIATION = 3
+
+# short form <-> long forms, in both directions
+_FORMS = {}
+for _short, _longs in SHORT_FORMS.items():
+    _FORMS.setdefault(_short, set()).update(_longs)
+    for _long in _longs:
+        _FORMS.setdefault(_long, set()).add(_short)
+
+
+def normalize_name(fullname: str) -> str:
+    """
+        Build the lookup key of a name: Unicode-normalized, case-folded and with
+        single spaces (e.g. 'Chris  Columbus' -> 'chris columbus').
+
+        :param fullname: Full name of the person
+        :return: Normalized key
+        """
+    return " ".join(unicodedata.normalize("NFKC", fullname).casefold().split())
+
+
+def _fold(key: str) -> str:
+    decomposed = unicodedata.normalize("NFKD", key)
+    return "".join(c for c in decomposed if not unicodedata.combining(c))
+
+
+def _split(key: str) -> tuple[tuple[str, str], str]:
+    # block key (folded last name, first initial) and folded given names;
+    # names can only match when their block keys are equal
+    tokens = _fold(key).split()
+    if len(tokens) == 1:
+        return (tokens[0], ""), ""
+    return (tokens[-1], tokens[0][0]), " ".join(tokens[:-1])
+
+
+def _abbreviates(short: str, long: str) -> bool:
+    if long in _FORMS.get(short, ()):
+        return True
+    return short.endswith(".") and len(short) > MIN_ABBREVIATION and long.startswith(short[:-1])
+
+
+@functools.cache
+def _sequence_matcher() -> type:
+    # difflib is only needed for fuzzy matching, import it once on first use
+    from difflib import SequenceMatcher
+    return SequenceMatcher
+
+
+def _ratio(first: str, second: str) -> float:
+    return _sequence_matcher()(None, first, second).ratio()
+
+
+def _given_similarity(first: str, second: str) -> float:
+    if first == second or _abbreviates(first, second) or _abbreviates(second, first):
+        return 1.0
+    return _ratio(first, second)
+
+
+def _bigrams(text: str) -> set[str]:
+    return {text[i:i + 2] for i in range(len(text) - 1)} or {text}
+
+
+def name_similarity(first: str, second: str) -> float:
+    """
+        Compare two names. When the last names are equal only the given names are
+        compared, and a known short form ('Chris' and 'Christopher') or an
+        abbreviation with a dot ('Chris.') counts as a full match.
+
+        :param first: First name to compare
+        :param second: Second name to compare
+        :return: Similarity between 0 (different) and 1 (same)
+        """
+    first_block, first_given = _split(normalize_name(first))
+    second_block, second_given = _split(normalize_name(second))
+    if first_block[0] != second_block[0] or not first_given or not second_given:
+        return _ratio(_fold(normalize_name(first)), _fold(normalize_name(second)))
+    return _given_similarity(first_given, second_given)
+
+
+class _Block:
+    """
+        The spellings of the persons that share a block key, indexed to find
+        the spellings that can be similar to a given name without comparing all of them.
+
+        :names: Dictionary mapping a folded given name to the persons with that spelling.
+        :lengths: Dictionary mapping a length to the given names of that length.
+        :grams: Dictionary mapping a bigram to the given names that contain it.
+        :dotted: Given names that are abbreviations with a trailing dot.
+        """
+
+    def __init__(self) -> None:
+        self.names = {}
+        self.lengths = {}
+        self.grams = {}
+        self.dotted = []
+
+    def add(self, given: str, person: "Person") -> None:
+        if given not in self.names:
+            self.names[given] = []
+            self.lengths.setdefault(len(given), []).append(given)
+            for gram in _bigrams(given):
+                self.grams.setdefault(gram, []).append(given)
+            if given.endswith("."):
+                self.dotted.append(given)
+        self.names[given].append(person)
+
+    def candidates(self, given: str, threshold: float) -> set[str]:
+        """
+                :return: The spellings in the block that can reach the threshold with given.
+                """
+        found = {name for name in _FORMS.get(given, ()) if name in self.names}
+        if given in self.names:
+            found.add(given)
+        if given.endswith(".") and len(given) > MIN_ABBREVIATION:
+            found.update(name for name in self.names if name.startswith(given[:-1]))
+        found.update(name for name in self.dotted if given.startswith(name[:-1]))
+        if threshold <= 0:
+            found.update(self.names)
+            return found
+
+        # ratio() is 2 * matches / (a + b): that bounds the length of a match, and
+        # every unmatched character breaks at most two of the shared bigrams
+        a = len(given)
+        grams = _bigrams(given)
+        shortest, longest = ceil(a * threshold / (2 - threshold)), floor(a * (2 - threshold) / threshold)
+        needed = {}
+        for b in range(shortest, longest + 1):
+            matches = ceil(threshold * (a + b) / 2 - 1e-9)
+            needed[b] = len(grams) - 2 * (a - matches) - (b - matches)
+            if needed[b] <= 0:
+                found.update(self.lengths.get(b, ()))
+
+        shared = {}
+        for gram in grams:
+            for name in self.grams.get(gram, ()):
+                shared[name] = shared.get(name, 0) + 1
+        found.update(name for name, count in shared.items()
+                     if len(name) in needed and count >= needed[len(name)])
+        return found
+
+
 class Person:
     """
         Represents a person (e.g., director) and ensures only one instance
         per unique fullname exists (flyweight pattern).
 
         :fullname: The full name of the person (read-only).
-        :_instances: Dictionary storing all Person instances keyed by lowercase fullname.
+        :_instances: Dictionary storing all Person instances keyed by normalized fullname.
+        :_aliases: Dictionary mapping other spellings that were matched to a Person.
+        :_blocks: Dictionary mapping a block key (folded last name, first initial)
+                  to the spellings of the persons in that block, used for fuzzy matching.
+        :_given_names: Folded given names of all spellings of this person.
         """
     _instances = {}  # Flyweight storage
+    _aliases = {}
+    _blocks = {}
 
     def __init__(self, fullname: str) -> None:
         """
@@ -17,12 +204,24 @@ class Person:
         if not fullname:
             raise ValueError("Fullname is required.")
 
-        key = fullname.lower()
-        if key in Person._instances:
+        key = normalize_name(fullname)
+        if not key:
+            raise ValueError("Fullname is required.")
+        if key in Person._instances or key in Person._aliases:
             raise ValueError("Person with this fullname already exists.")
 
         self.__fullname = fullname  # name cannot be modified
+        self._given_names = []
         Person._instances[key] = self
+        self._add_spelling(key)
+
+    def _add_spelling(self, key: str) -> None:
+        block_key, given = _split(key)
+        self._given_names.append(given)
+        block = Person._blocks.get(block_key)
+        if block is None:
+            block = Person._blocks[block_key] = _Block()
+        block.add(given, self)
 
     @property
     def fullname(self) -> str:
@@ -34,23 +233,71 @@ class Person:
     def __eq__(self, other: object) -> bool:
         if not isinstance(other, Person):
             return False
-        return self.fullname.lower() == other.fullname.lower()
+        return normalize_name(self.fullname) == normalize_name(other.fullname)
 
     @classmethod
     def persons_count(cls) -> int:
         return len(cls._instances)
 
-def get_person(fullname: str) -> Person:
+def get_person(fullname: str, threshold: float = None) -> Person:
     """
         Retrieve an existing Person object by fullname or create a new one if it
         doesn't exist.
 
+        Names are compared on their normalized key. With a threshold, a name that
+        is not known yet is also compared with the persons that have the same
+        last name and first initial, and the most similar one is returned when its
+        similarity reaches the threshold.
+
         :param fullname: Full name of the person
+        :param threshold: Minimum similarity (0..1) for a fuzzy match, or None for exact matching
         :return: Person instance corresponding to the fullname
         """
-    key = fullname.lower()
+    key = normalize_name(fullname)
 
     if key in Person._instances:
         return Person._instances[key]
+    if key in Person._aliases:
+        return Person._aliases[key]
+
+    if threshold is not None and key:
+        match = find_similar_person(fullname, threshold)
+        if match is not None:
+            Person._aliases[key] = match  # next lookup of this spelling is exact
+            match._add_spelling(key)
+            return match
+
+    return Person(fullname)
+
+
+def find_similar_person(fullname: str, threshold: float = DEFAULT_THRESHOLD) -> Person:
+    """
+        Find the existing person whose name is most similar to fullname.
+        Only persons in the same block (last name and first initial) are compared,
+        and a person matches only when every spelling already matched to them
+        reaches the threshold, so 'Christine' does not join 'Chris' after
+        'Christopher' did.
+
+        :param fullname: Full name to look for
+        :param threshold: Minimum similarity (0..1)
+        :return: The most similar Person, or None if no one reaches the threshold
+        """
+    key = normalize_name(fullname)
+    if not key:
+        return None
+    block_key, given = _split(key)
+    block = Person._blocks.get(block_key)
+    if block is None:
+        return None
 
-    return Person(fullname)
\ No newline at end of file
+    best, best_similarity = None, 0.0
+    compared = set()
+    for name in sorted(block.candidates(given, threshold)):  # ties go to the same person every run
+        for candidate in block.names[name]:
+            if id(candidate) in compared:
+                continue
+            compared.add(id(candidate))
+            similarity = min(_given_similarity(given, other) for other in candidate._given_names)
+            if similarity >= threshold and similarity > best_similarity:
+                best, best_similarity = candidate, similarity
+    return best
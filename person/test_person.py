@@ -0,0 +1,66 @@
+import unittest
+
+from person.person import Person, get_person, find_similar_person, name_similarity, normalize_name
+
+
+class FuzzyPersonTestCase(unittest.TestCase):
+    def test_normalize_name(self):
+        self.assertEqual(normalize_name("  Chris \t Columbus "), "chris columbus")
+        self.assertEqual(normalize_name("ＣＨＲＩＳ"), "chris")
+
+    def test_exact_match_ignores_spacing(self):
+        person = get_person("Bertrand  Tavernier")
+        self.assertIs(get_person("bertrand tavernier"), person)
+        with self.assertRaises(ValueError):
+            Person("Bertrand Tavernier")
+
+    def test_fuzzy_match(self):
+        person = get_person("Chris Nolanesque", 0.9)
+        self.assertIs(get_person("Christopher Nolanesque", 0.9), person)
+        self.assertIs(get_person("Chris Nolanésque", 0.9), person)
+        # an alias is remembered, but it is not a new person
+        count = Person.persons_count()
+        self.assertIs(get_person("Christopher Nolanesque"), person)
+        self.assertEqual(Person.persons_count(), count)
+
+    def test_no_fuzzy_match(self):
+        john = get_person("John Testperson", 0.9)
+        self.assertIsNot(get_person("Jane Testperson", 0.9), john)
+        self.assertIsNot(get_person("Jo Testperson", 0.9), john)
+        self.assertIsNot(get_person("Testperson John", 0.9), john)
+        # without a threshold only exact names are merged
+        self.assertIsNot(get_person("Johnny Testperson"), john)
+
+    def test_only_known_short_forms(self):
+        joe = get_person("Joe Wrightsome", 0.9)
+        self.assertIsNot(get_person("Joel Wrightsome", 0.9), joe)
+        dan = get_person("Dan Smithsome", 0.9)
+        self.assertIsNot(get_person("Dana Smithsome", 0.9), dan)
+        self.assertIs(get_person("Daniel Smithsome", 0.9), dan)
+        bertrand = get_person("Bertrand Taverniersome", 0.9)
+        self.assertIs(get_person("Bertr. Taverniersome", 0.9), bertrand)
+
+    def test_aliases_do_not_chain(self):
+        chris = get_person("Chris Columbusque", 0.9)
+        self.assertIs(get_person("Christopher Columbusque", 0.9), chris)
+        self.assertIsNot(get_person("Christine Columbusque", 0.9), chris)
+        with self.assertRaises(ValueError):
+            Person("Christopher Columbusque")
+
+    def test_large_block(self):
+        # many persons with the same last name are not compared one by one
+        for i in range(2000):
+            get_person(f"Jo{i:04d}x Blocksome", 0.9)
+        self.assertIs(get_person("Jo1234x  Blocksome", 0.9), get_person("Jo1234x Blocksome"))
+        self.assertIs(get_person("Jo1234xx Blocksome", 0.9), get_person("Jo1234x Blocksome"))
+
+    def test_similarity(self):
+        self.assertEqual(name_similarity("Chris Columbus", "christopher  columbus"), 1.0)
+        self.assertLess(name_similarity("Joel Coen", "Ethan Coen"), 0.9)
+        self.assertLess(name_similarity("Joe Wright", "Joel Wright"), 0.9)
+        self.assertLess(name_similarity("Christine Columbus", "Christopher Columbus"), 0.9)
+        self.assertIsNone(find_similar_person("Nobody Atall"))
+
+
+if __name__ == '__main__':
+    unittest.main()